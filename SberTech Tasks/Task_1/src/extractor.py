@@ -3,13 +3,75 @@ Dependency extractor module for processing package dependencies.
 """
 
 import logging
-from typing import Dict, List, Set
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
 
 from src.validation import validate_package_name, ValidationError
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PackageTable:
+    """
+    Column-oriented view of a list of (PackageMetadata, List[Dependency]) tuples.
+
+    Dependency names of all packages are kept in flat lists; the requires of
+    package i are requires[requires_offsets[i]:requires_offsets[i + 1]], and
+    likewise for provides. For source packages "requires" holds both
+    buildrequires and requires, for binary packages only requires.
+    """
+
+    names: List[str] = field(default_factory=list)
+    is_source: List[bool] = field(default_factory=list)
+    requires: List[str] = field(default_factory=list)
+    requires_offsets: array = field(default_factory=lambda: array("L", [0]))
+    provides: List[str] = field(default_factory=list)
+    provides_offsets: array = field(default_factory=lambda: array("L", [0]))
+
+    @classmethod
+    def from_packages(cls, packages_with_deps: List[tuple]) -> "PackageTable":
+        """
+        Build a table from (PackageMetadata, List[Dependency]) tuples.
+
+        Args:
+            packages_with_deps: List of tuples (PackageMetadata, List[Dependency])
+
+        Returns:
+            PackageTable with one row per package, in input order
+        """
+        table = cls()
+        requires, provides = table.requires, table.provides
+
+        for metadata, dependencies in packages_with_deps:
+            requires_types = ("buildrequires", "requires") if metadata.is_source else ("requires",)
+
+            for dep in dependencies:
+                if dep.type == "provides":
+                    provides.append(dep.name)
+                elif dep.type in requires_types:
+                    requires.append(dep.name)
+
+            table.names.append(metadata.name)
+            table.is_source.append(metadata.is_source)
+            table.requires_offsets.append(len(requires))
+            table.provides_offsets.append(len(provides))
+
+        return table
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def package_requires(self, index: int) -> List[str]:
+        """Return the requires of the package at the given row."""
+        return self.requires[self.requires_offsets[index] : self.requires_offsets[index + 1]]
+
+    def package_provides(self, index: int) -> List[str]:
+        """Return the provides of the package at the given row."""
+        return self.provides[self.provides_offsets[index] : self.provides_offsets[index + 1]]
+
+
 class DependencyExtractor:
     """Extracts and processes package dependencies"""
 
@@ -26,12 +88,16 @@ class DependencyExtractor:
         """Initialize the dependency extractor"""
         self.virtual_provides_map: Dict[str, Set[str]] = {}
 
-    def extract_runtime_deps(self, packages_with_deps: List[tuple]) -> Dict[str, List[str]]:
+    def extract_runtime_deps(
+        self, packages_with_deps: List[tuple], table: Optional[PackageTable] = None
+    ) -> Dict[str, List[str]]:
         """
         Extract runtime dependencies from binary RPM packages.
 
         Args:
             packages_with_deps: List of tuples (PackageMetadata, List[Dependency])
+            table: PackageTable built from packages_with_deps, so callers running
+                several passes over one list build it only once (built here if None)
 
         Returns:
             Dictionary mapping package names to their runtime dependencies
@@ -41,37 +107,38 @@ class DependencyExtractor:
         try:
             runtime_deps = {}
 
+            if table is None:
+                table = PackageTable.from_packages(packages_with_deps)
+
             # First pass: build provides map
             logger.debug("Building provides map for dependency resolution")
-            self._build_provides_map(packages_with_deps)
+            self._build_provides_map(packages_with_deps, table)
 
             # Count binary packages
-            binary_packages = [p for p, _ in packages_with_deps if not p.is_source]
-            total_binary = len(binary_packages)
+            total_binary = len(table) - sum(table.is_source)
             logger.info(f"Processing {total_binary} binary packages")
 
             # Second pass: extract runtime dependencies
             processed = 0
-            for metadata, dependencies in packages_with_deps:
+            for index, name in enumerate(table.names):
                 # Skip source packages for runtime dependencies
-                if metadata.is_source:
+                if table.is_source[index]:
                     continue
 
                 try:
                     # Validate package name
                     try:
-                        pkg_name = validate_package_name(metadata.name)
+                        pkg_name = validate_package_name(name)
                     except ValidationError as e:
-                        logger.warning(f"Invalid package name {metadata.name}: {e}")
+                        logger.warning(f"Invalid package name {name}: {e}")
                         continue
 
                     requires = []
 
-                    for dep in dependencies:
-                        if dep.type == "requires":
-                            # Resolve and filter dependency
-                            resolved_deps = self._resolve_dependency(dep.name)
-                            requires.extend(resolved_deps)
+                    for dep_name in table.package_requires(index):
+                        # Resolve and filter dependency
+                        resolved_deps = self._resolve_dependency(dep_name)
+                        requires.extend(resolved_deps)
 
                     # Remove duplicates and self-references
                     requires = list(set(requires))
@@ -82,10 +149,10 @@ class DependencyExtractor:
                     processed += 1
 
                 except Exception as e:
-                    logger.warning(f"Error extracting runtime deps for {metadata.name}: {e}")
+                    logger.warning(f"Error extracting runtime deps for {name}: {e}")
                     logger.debug("Runtime dependency extraction error:", exc_info=True)
                     # Continue with empty dependencies
-                    runtime_deps[metadata.name] = []
+                    runtime_deps[name] = []
 
             logger.info(f"Extracted runtime dependencies for {len(runtime_deps)} packages")
             return runtime_deps
@@ -94,12 +161,16 @@ class DependencyExtractor:
             logger.error(f"Failed to extract runtime dependencies: {e}", exc_info=True)
             raise
 
-    def extract_build_deps(self, packages_with_deps: List[tuple]) -> Dict[str, List[str]]:
+    def extract_build_deps(
+        self, packages_with_deps: List[tuple], table: Optional[PackageTable] = None
+    ) -> Dict[str, List[str]]:
         """
         Extract build dependencies from source RPM packages.
 
         Args:
             packages_with_deps: List of tuples (PackageMetadata, List[Dependency])
+            table: PackageTable built from packages_with_deps, so callers running
+                several passes over one list build it only once (built here if None)
 
         Returns:
             Dictionary mapping package names to their build dependencies
@@ -109,38 +180,39 @@ class DependencyExtractor:
         try:
             build_deps = {}
 
+            if table is None:
+                table = PackageTable.from_packages(packages_with_deps)
+
             # Ensure provides map is built
             if not self.virtual_provides_map:
                 logger.debug("Building provides map for dependency resolution")
-                self._build_provides_map(packages_with_deps)
+                self._build_provides_map(packages_with_deps, table)
 
             # Count source packages
-            source_packages = [p for p, _ in packages_with_deps if p.is_source]
-            total_source = len(source_packages)
+            total_source = sum(table.is_source)
             logger.info(f"Processing {total_source} source packages")
 
             # Extract build dependencies from source packages
             processed = 0
-            for metadata, dependencies in packages_with_deps:
+            for index, name in enumerate(table.names):
                 # Only process source packages for build dependencies
-                if not metadata.is_source:
+                if not table.is_source[index]:
                     continue
 
                 try:
                     # Validate package name
                     try:
-                        pkg_name = validate_package_name(metadata.name)
+                        pkg_name = validate_package_name(name)
                     except ValidationError as e:
-                        logger.warning(f"Invalid package name {metadata.name}: {e}")
+                        logger.warning(f"Invalid package name {name}: {e}")
                         continue
 
                     requires = []
 
-                    for dep in dependencies:
-                        if dep.type in ("buildrequires", "requires"):
-                            # Resolve and filter dependency
-                            resolved_deps = self._resolve_dependency(dep.name)
-                            requires.extend(resolved_deps)
+                    for dep_name in table.package_requires(index):
+                        # Resolve and filter dependency
+                        resolved_deps = self._resolve_dependency(dep_name)
+                        requires.extend(resolved_deps)
 
                     # Remove duplicates and self-references
                     requires = list(set(requires))
@@ -151,10 +223,10 @@ class DependencyExtractor:
                     processed += 1
 
                 except Exception as e:
-                    logger.warning(f"Error extracting build deps for {metadata.name}: {e}")
+                    logger.warning(f"Error extracting build deps for {name}: {e}")
                     logger.debug("Build dependency extraction error:", exc_info=True)
                     # Continue with empty dependencies
-                    build_deps[metadata.name] = []
+                    build_deps[name] = []
 
             logger.info(f"Extracted build dependencies for {len(build_deps)} packages")
             return build_deps
@@ -163,28 +235,29 @@ class DependencyExtractor:
             logger.error(f"Failed to extract build dependencies: {e}", exc_info=True)
             raise
 
-    def _build_provides_map(self, packages_with_deps: List[tuple]) -> None:
+    def _build_provides_map(
+        self, packages_with_deps: List[tuple], table: Optional[PackageTable] = None
+    ) -> None:
         """
         Build a mapping of virtual provides to actual package names.
 
         Args:
             packages_with_deps: List of tuples (PackageMetadata, List[Dependency])
+            table: PackageTable built from packages_with_deps (built here if None)
         """
         logger.info("Building virtual provides map")
 
         self.virtual_provides_map = {}
 
-        for metadata, dependencies in packages_with_deps:
-            pkg_name = metadata.name
-
-            for dep in dependencies:
-                if dep.type == "provides":
-                    provide_name = dep.name
+        if table is None:
+            table = PackageTable.from_packages(packages_with_deps)
 
-                    if provide_name not in self.virtual_provides_map:
-                        self.virtual_provides_map[provide_name] = set()
+        for index, pkg_name in enumerate(table.names):
+            for provide_name in table.package_provides(index):
+                if provide_name not in self.virtual_provides_map:
+                    self.virtual_provides_map[provide_name] = set()
 
-                    self.virtual_provides_map[provide_name].add(pkg_name)
+                self.virtual_provides_map[provide_name].add(pkg_name)
 
         logger.info(f"Built provides map with {len(self.virtual_provides_map)} entries")
 
@@ -141,6 +141,7 @@ def safe_write(
     mode: str = "w",
     encoding: Optional[str] = "utf-8",
     atomic: bool = True,
+    buffering: int = -1,
 ):
     """
     Context manager for safe file writing with atomic operations.
@@ -154,6 +155,7 @@ def safe_write(
         mode: File mode ('w' for text, 'wb' for binary)
         encoding: Text encoding (only for text mode)
         atomic: If True, use atomic write operation
+        buffering: Buffer size passed to open() (-1 for the default)
 
     Yields:
         File object for writing
@@ -167,10 +169,10 @@ def safe_write(
     if not atomic:
         # Simple non-atomic write
         if "b" in mode:
-            with open(file_path, mode) as f:
+            with open(file_path, mode, buffering=buffering) as f:
                 yield f
         else:
-            with open(file_path, mode, encoding=encoding) as f:
+            with open(file_path, mode, buffering=buffering, encoding=encoding) as f:
                 yield f
         return
 
@@ -189,10 +191,10 @@ def safe_write(
 
         # Write to temporary file
         if "b" in mode:
-            with open(temp_file, mode) as f:
+            with open(temp_file, mode, buffering=buffering) as f:
                 yield f
         else:
-            with open(temp_file, mode, encoding=encoding) as f:
+            with open(temp_file, mode, buffering=buffering, encoding=encoding) as f:
                 yield f
 
         # If we get here, write was successful - move temp file to target
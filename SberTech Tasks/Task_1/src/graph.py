@@ -5,12 +5,58 @@ This module provides data structures and algorithms for building dependency grap
 from package information, detecting cycles, and exporting graphs for visualization.
 """
 
-from typing import Dict, List, Set, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Set, Optional
 from dataclasses import dataclass, field
 from collections import defaultdict
 from enum import Enum
+from itertools import islice
 import json
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+def dumps_json(data: object, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON, using orjson when it is installed.
+
+    Args:
+        data: JSON-serializable object
+        indent: If True, pretty-print with two-space indentation
+
+    Returns:
+        UTF-8 encoded JSON document (non-ASCII characters are not escaped)
+
+    Raises:
+        TypeError: If data is not JSON-serializable
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads_json(data: bytes) -> object:
+    """
+    Parse a JSON document, using orjson when it is installed.
+
+    Args:
+        data: UTF-8 encoded JSON document
+
+    Returns:
+        Parsed object
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class NodeColor(Enum):
     """Colors for DFS cycle detection algorithm."""
@@ -66,6 +112,8 @@ class DependencyGraph:
         self.edges: List[Edge] = []
         self.adjacency: Dict[str, Set[str]] = defaultdict(set)
         self.reverse_adjacency: Dict[str, Set[str]] = defaultdict(set)
+        # Cached result of detect_cycles(), reset whenever the graph changes
+        self._cycles: Optional[List[List[str]]] = None
 
     def add_node(self, package: str, metadata: Optional[Dict[str, str]] = None) -> None:
         """
@@ -77,6 +125,7 @@ class DependencyGraph:
         """
         if package not in self.nodes:
             self.nodes[package] = Node(id=package, label=package, metadata=metadata or {})
+            self._cycles = None
 
     def add_edge(self, from_pkg: str, to_pkg: str, edge_type: str = "dependency") -> None:
         """
@@ -97,6 +146,7 @@ class DependencyGraph:
             self.edges.append(edge)
             self.adjacency[from_pkg].add(to_pkg)
             self.reverse_adjacency[to_pkg].add(from_pkg)
+            self._cycles = None
 
     def get_dependencies(self, package: str) -> List[str]:
         """
@@ -108,7 +158,7 @@ class DependencyGraph:
         Returns:
             List of package names that this package depends on
         """
-        return list(self.adjacency.get(package, set()))
+        return list(self.adjacency.get(package, ()))
 
     def get_dependents(self, package: str) -> List[str]:
         """
@@ -120,7 +170,7 @@ class DependencyGraph:
         Returns:
             List of package names that depend on this package
         """
-        return list(self.reverse_adjacency.get(package, set()))
+        return list(self.reverse_adjacency.get(package, ()))
 
     def has_node(self, package: str) -> bool:
         """Check if a node exists in the graph."""
@@ -169,7 +219,7 @@ class DependencyGraph:
                     raise ValueError(f"Dependencies for {package} must be a list")
 
                 for dep in deps:
-                    if not self.has_node(dep):
+                    if dep not in self.nodes:
                         # Create placeholder node for missing package
                         self.add_node(dep, {"placeholder": "true"})
                         missing_packages.add(dep)
@@ -182,10 +232,23 @@ class DependencyGraph:
                     f"Created {len(missing_packages)} placeholder nodes for missing packages"
                 )
 
-            # Third pass: Add edges for all dependency relationships
+            # Third pass: Add edges for all dependency relationships. Both
+            # endpoints of every edge already exist, so edges are inserted
+            # directly instead of going through add_edge() (and two add_node()
+            # calls) per dependency.
+            edges = self.edges
+            adjacency = self.adjacency
+            reverse_adjacency = self.reverse_adjacency
             for package, deps in dependencies.items():
+                if not deps:
+                    continue
+                targets = adjacency[package]
                 for dep in deps:
-                    self.add_edge(package, dep)
+                    if dep not in targets:
+                        targets.add(dep)
+                        reverse_adjacency[dep].add(package)
+                        edges.append(Edge(source=package, target=dep))
+            self._cycles = None
 
         except Exception as e:
             from logging import getLogger
@@ -196,7 +259,12 @@ class DependencyGraph:
 
     def detect_cycles(self) -> List[List[str]]:
         """
-        Detect circular dependencies in the graph using DFS with color marking.
+        Detect circular dependencies in the graph using an iterative DFS.
+
+        Every back edge found during the traversal yields one cycle.
+
+        The result is cached until the graph is modified, so repeated calls
+        (e.g. for logging and for the summary file) only traverse the graph once.
 
         Returns:
             List of cycles, where each cycle is a list of package names
@@ -204,43 +272,12 @@ class DependencyGraph:
         if not self.nodes:
             return []
 
-        try:
-            colors: Dict[str, NodeColor] = {node: NodeColor.WHITE for node in self.nodes}
-            parent: Dict[str, Optional[str]] = {node: None for node in self.nodes}
-            cycles: List[List[str]] = []
-
-            def dfs_visit(node: str, path: List[str]) -> None:
-                """
-                Visit a node during DFS traversal.
-
-                Args:
-                    node: Current node being visited
-                    path: Current path from root to this node
-                """
-                colors[node] = NodeColor.GRAY
-                path.append(node)
-
-                for neighbor in self.adjacency.get(node, set()):
-                    if colors[neighbor] == NodeColor.WHITE:
-                        parent[neighbor] = node
-                        dfs_visit(neighbor, path.copy())
-                    elif colors[neighbor] == NodeColor.GRAY:
-                        # Found a back edge - cycle detected
-                        try:
-                            cycle_start_idx = path.index(neighbor)
-                            cycle = path[cycle_start_idx:] + [neighbor]
-                            cycles.append(cycle)
-                        except ValueError:
-                            # Neighbor not in path, skip
-                            pass
-
-                colors[node] = NodeColor.BLACK
-
-            # Run DFS from each unvisited node
-            for node in self.nodes:
-                if colors[node] == NodeColor.WHITE:
-                    dfs_visit(node, [])
+        if self._cycles is not None:
+            return self._cycles
 
+        try:
+            cycles = list(self._iter_cycles())
+            self._cycles = cycles
             return cycles
 
         except Exception as e:
@@ -250,6 +287,75 @@ class DependencyGraph:
             logger.error(f"Error detecting cycles: {e}", exc_info=True)
             return []
 
+    def has_cycle(self) -> bool:
+        """
+        Check whether the graph contains at least one cycle.
+
+        Stops at the first back edge instead of enumerating every cycle.
+
+        Returns:
+            True if the graph has a circular dependency
+        """
+        if self._cycles is not None:
+            return bool(self._cycles)
+        return next(self._iter_cycles(), None) is not None
+
+    def count_cycles(self, limit: Optional[int] = None) -> int:
+        """
+        Count the cycles reported by detect_cycles().
+
+        Args:
+            limit: Stop counting once this many cycles have been found
+
+        Returns:
+            Number of cycles, capped at limit if given
+        """
+        if self._cycles is None and limit is not None:
+            return sum(1 for _ in islice(self._iter_cycles(), limit))
+
+        count = len(self.detect_cycles())
+        return count if limit is None else min(count, limit)
+
+    def _iter_cycles(self) -> Iterator[List[str]]:
+        """
+        Yield cycles one at a time as the DFS finds them.
+
+        Yields:
+            Cycles as lists of package names, first node repeated at the end
+        """
+        # Iterative DFS: a node is GRAY while it sits on the current path
+        # (tracked with its position in on_path) and BLACK once finished.
+        # Uses an explicit stack of neighbour iterators, so deep dependency
+        # chains cannot hit the recursion limit and paths are never copied.
+        visited: Set[str] = set()
+        on_path: Dict[str, int] = {}
+
+        for root in self.nodes:
+            if root in visited:
+                continue
+
+            visited.add(root)
+            on_path[root] = 0
+            path = [root]
+            stack = [iter(self.adjacency.get(root, ()))]
+
+            while stack:
+                for neighbor in stack[-1]:
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        on_path[neighbor] = len(path)
+                        path.append(neighbor)
+                        stack.append(iter(self.adjacency.get(neighbor, ())))
+                        break
+
+                    cycle_start_idx = on_path.get(neighbor)
+                    if cycle_start_idx is not None:
+                        # Found a back edge - cycle detected
+                        yield path[cycle_start_idx:] + [neighbor]
+                else:
+                    stack.pop()
+                    del on_path[path.pop()]
+
     def export_to_json(self, graph_type: str = "dependency") -> str:
         """
         Export the graph to JSON format for visualization.
@@ -274,7 +380,51 @@ class DependencyGraph:
                 "edges": [edge.to_dict() for edge in self.edges],
             }
 
-            return json.dumps(graph_data, indent=2, ensure_ascii=False)
+            return dumps_json(graph_data, indent=True).decode("utf-8")
+
+        except (TypeError, ValueError) as e:
+            from logging import getLogger
+
+            logger = getLogger(__name__)
+            logger.error(f"Failed to serialize graph to JSON: {e}", exc_info=True)
+            raise RuntimeError(f"JSON serialization failed: {e}") from e
+
+    def export_to_json_stream(self, fp: BinaryIO, graph_type: str = "dependency") -> None:
+        """
+        Write the graph as JSON to a file object, one node/edge at a time.
+
+        Produces the same data as export_to_json() without building the whole
+        JSON string in memory first. The layout differs: each node or edge is
+        written compactly on its own line instead of being fully indented.
+
+        Args:
+            fp: Binary file object to write to
+            graph_type: Type of graph (e.g., "runtime", "build", "dependency")
+
+        Raises:
+            ValueError: If graph_type is invalid
+            RuntimeError: If JSON serialization fails
+        """
+        if not isinstance(graph_type, str) or not graph_type:
+            raise ValueError("graph_type must be a non-empty string")
+
+        def write_items(items: Iterable[Dict]) -> None:
+            separator = b"\n    "
+            for item in items:
+                fp.write(separator)
+                fp.write(dumps_json(item))
+                separator = b",\n    "
+            if separator != b"\n    ":
+                fp.write(b"\n  ")
+
+        try:
+            fp.write(b'{\n  "graph_type": ')
+            fp.write(dumps_json(graph_type))
+            fp.write(b',\n  "nodes": [')
+            write_items(node.to_dict() for node in self.nodes.values())
+            fp.write(b'],\n  "edges": [')
+            write_items(edge.to_dict() for edge in self.edges)
+            fp.write(b"]\n}")
 
         except (TypeError, ValueError) as e:
             from logging import getLogger
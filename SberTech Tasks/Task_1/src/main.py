@@ -10,17 +10,17 @@ This module coordinates the entire workflow:
 """
 
 import argparse
-import json
 import logging
+import os
 import sys
 import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from src.repository import RepositoryDownloader, PackageInfo, RepositoryDownloadError
 from src.parser import PackageMetadata, Dependency
-from src.extractor import DependencyExtractor
-from src.graph import DependencyGraph
+from src.extractor import DependencyExtractor, PackageTable
+from src.graph import DependencyGraph, dumps_json
 from src.validation import validate_url, ValidationError
 from src.file_utils import safe_write
 
@@ -80,6 +80,10 @@ def setup_logging(verbose: bool = False, log_file: str = "rpm_dependency_graph.l
 
 logger = logging.getLogger(__name__)
 
+# Write buffer for graph files; large enough that streaming node/edge records
+# does not turn into many small write() syscalls
+GRAPH_WRITE_BUFFER = 1024 * 1024
+
 
 class PackageProcessingError(Exception):
     """Base exception for package processing errors"""
@@ -182,24 +186,21 @@ def parse_packages(
                 is_source=pkg_info.is_source,
             )
 
-            # Extract dependencies from PackageInfo
-            dependencies: List[Dependency] = []
-            
-            # Add requires as dependencies
-            for req in pkg_info.requires:
-                dep_type = "buildrequires" if pkg_info.is_source else "requires"
-                dependencies.append(Dependency(name=req, type=dep_type))
-            
-            # Add provides
-            for prov in pkg_info.provides:
-                dependencies.append(Dependency(name=prov, type="provides"))
+            # Extract dependencies from PackageInfo: requires first, then provides
+            dep_type = "buildrequires" if pkg_info.is_source else "requires"
+            dependencies: List[Dependency] = [
+                Dependency(req, type=dep_type) for req in pkg_info.requires
+            ]
+            dependencies.extend(Dependency(prov, type="provides") for prov in pkg_info.provides)
 
             packages_with_deps.append((metadata, dependencies))
 
             # Progress indicator
             if idx % progress_interval == 0 or idx == total_packages:
                 progress_pct = (idx / total_packages) * 100
-                logger.info(f"Progress: {idx}/{total_packages} packages ({progress_pct:.1f}%)")
+                logger.info(
+                    "Progress: %d/%d packages (%.1f%%)", idx, total_packages, progress_pct
+                )
 
         except Exception as e:
             error_msg = f"Failed to process package {pkg_info.name}: {e}"
@@ -227,6 +228,47 @@ def parse_packages(
     return packages_with_deps
 
 
+def _build_and_detect(
+    dependencies: Dict[str, List[str]]
+) -> Tuple[DependencyGraph, List[List[str]]]:
+    """
+    Build a dependency graph and detect its cycles.
+
+    Args:
+        dependencies: Dictionary mapping package names to their dependencies
+
+    Returns:
+        Tuple of (graph, cycles)
+    """
+    graph = DependencyGraph()
+    graph.build_graph(dependencies)
+    return graph, graph.detect_cycles()
+
+
+def _log_graph_result(name: str, graph: DependencyGraph, cycles: List[List[str]]) -> None:
+    """
+    Log graph size and detected cycles.
+
+    Args:
+        name: Graph name used in messages ("runtime" or "build")
+        graph: The constructed graph
+        cycles: Cycles detected in the graph
+    """
+    logger.info(
+        "%s graph: %d nodes, %d edges", name.capitalize(), graph.node_count(), graph.edge_count()
+    )
+    if cycles:
+        logger.warning("Detected %d circular dependencies in %s graph", len(cycles), name)
+        # Joining long cycles is not free; skip it when warnings are filtered out
+        if logger.isEnabledFor(logging.WARNING):
+            for i, cycle in enumerate(cycles[:5]):  # Show first 5 cycles
+                logger.warning("  Cycle %d: %s", i + 1, " -> ".join(cycle))
+        if len(cycles) > 5:
+            logger.warning("  ... and %d more cycles", len(cycles) - 5)
+    else:
+        logger.info("No circular dependencies detected in %s graph", name)
+
+
 def build_dependency_graphs(
     packages_with_deps: List[Tuple[PackageMetadata, List[Dependency]]]
 ) -> Tuple[DependencyGraph, DependencyGraph]:
@@ -245,68 +287,74 @@ def build_dependency_graphs(
     logger.info("Building dependency graphs")
 
     try:
-        # Extract dependencies
+        # Extract dependencies; both passes read the same column-oriented table
         extractor = DependencyExtractor()
+        table = PackageTable.from_packages(packages_with_deps)
 
         logger.info("Extracting runtime dependencies...")
-        runtime_deps = extractor.extract_runtime_deps(packages_with_deps)
-        logger.info(f"Extracted runtime dependencies for {len(runtime_deps)} packages")
+        runtime_deps = extractor.extract_runtime_deps(packages_with_deps, table)
+        logger.info("Extracted runtime dependencies for %d packages", len(runtime_deps))
 
         logger.info("Extracting build dependencies...")
-        build_deps = extractor.extract_build_deps(packages_with_deps)
-        logger.info(f"Extracted build dependencies for {len(build_deps)} packages")
+        build_deps = extractor.extract_build_deps(packages_with_deps, table)
+        logger.info("Extracted build dependencies for %d packages", len(build_deps))
 
-        # Build runtime graph
         logger.info("Constructing runtime dependency graph...")
-        runtime_graph = DependencyGraph()
-        runtime_graph.build_graph(runtime_deps)
-
-        logger.info(
-            f"Runtime graph: {runtime_graph.node_count()} nodes, {runtime_graph.edge_count()} edges"
-        )
-
-        # Detect cycles in runtime graph
-        logger.info("Detecting cycles in runtime graph...")
-        runtime_cycles = runtime_graph.detect_cycles()
-        if runtime_cycles:
-            logger.warning(f"Detected {len(runtime_cycles)} circular dependencies in runtime graph")
-            for i, cycle in enumerate(runtime_cycles[:5]):  # Show first 5 cycles
-                logger.warning(f"  Cycle {i+1}: {' -> '.join(cycle)}")
-            if len(runtime_cycles) > 5:
-                logger.warning(f"  ... and {len(runtime_cycles) - 5} more cycles")
-        else:
-            logger.info("No circular dependencies detected in runtime graph")
-
-        # Build build dependency graph
+        runtime_graph, runtime_cycles = _build_and_detect(runtime_deps)
         logger.info("Constructing build dependency graph...")
-        build_graph = DependencyGraph()
-        build_graph.build_graph(build_deps)
+        build_graph, build_cycles = _build_and_detect(build_deps)
 
-        logger.info(
-            f"Build graph: {build_graph.node_count()} nodes, {build_graph.edge_count()} edges"
-        )
-
-        # Detect cycles in build graph
-        logger.info("Detecting cycles in build graph...")
-        build_cycles = build_graph.detect_cycles()
-        if build_cycles:
-            logger.warning(f"Detected {len(build_cycles)} circular dependencies in build graph")
-            for i, cycle in enumerate(build_cycles[:5]):  # Show first 5 cycles
-                logger.warning(f"  Cycle {i+1}: {' -> '.join(cycle)}")
-            if len(build_cycles) > 5:
-                logger.warning(f"  ... and {len(build_cycles) - 5} more cycles")
-        else:
-            logger.info("No circular dependencies detected in build graph")
+        _log_graph_result("runtime", runtime_graph, runtime_cycles)
+        _log_graph_result("build", build_graph, build_cycles)
 
         return runtime_graph, build_graph
 
     except Exception as e:
-        logger.error(f"Failed to build dependency graphs: {e}", exc_info=True)
+        logger.error("Failed to build dependency graphs: %s", e, exc_info=True)
         raise PackageProcessingError(f"Graph construction failed: {e}") from e
 
 
+def _write_graph_file(
+    graph_file: Path, graph: DependencyGraph, graph_type: str, compress: bool = False
+) -> None:
+    """
+    Atomically write one graph as JSON, optionally zstd-compressed.
+
+    Args:
+        graph_file: Target file path
+        graph: Graph to write
+        graph_type: Graph type recorded in the file ("runtime" or "build")
+        compress: If True, write a zstd-compressed stream
+
+    Raises:
+        PackageProcessingError: If compression is requested but zstandard is missing
+    """
+    if not compress:
+        with safe_write(graph_file, mode="wb", atomic=True, buffering=GRAPH_WRITE_BUFFER) as f:
+            graph.export_to_json_stream(f, graph_type=graph_type)
+        return
+
+    try:
+        import zstandard as zstd
+    except ImportError as e:
+        raise PackageProcessingError(
+            "Compressed output requires the 'zstandard' library. "
+            "Install it with: pip install zstandard"
+        ) from e
+
+    # Level 3: package names repeat constantly, so this shrinks the file several
+    # times over; a single thread keeps up with a graph file of a few MB
+    compressor = zstd.ZstdCompressor(level=3)
+    with safe_write(graph_file, mode="wb", atomic=True) as f:
+        with compressor.stream_writer(f, closefd=False) as writer:
+            graph.export_to_json_stream(writer, graph_type=graph_type)
+
+
 def save_graphs(
-    runtime_graph: DependencyGraph, build_graph: DependencyGraph, output_dir: str = "data"
+    runtime_graph: DependencyGraph,
+    build_graph: DependencyGraph,
+    output_dir: str = "data",
+    compress: bool = False,
 ) -> None:
     """
     Save dependency graphs to JSON files with error handling.
@@ -315,35 +363,34 @@ def save_graphs(
         runtime_graph: Runtime dependency graph
         build_graph: Build dependency graph
         output_dir: Directory to save graph files
+        compress: If True, write zstd-compressed *_graph.json.zst files
+            instead of plain *_graph.json
 
     Raises:
         PackageProcessingError: If saving fails
     """
-    logger.info(f"Saving graphs to {output_dir}")
+    logger.info("Saving graphs to %s", output_dir)
 
     try:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        # Save runtime graph using atomic write
-        logger.info("Saving runtime graph...")
-        runtime_file = output_path / "runtime_graph.json"
-        try:
-            with safe_write(runtime_file, mode="w", encoding="utf-8", atomic=True) as f:
-                f.write(runtime_graph.export_to_json(graph_type="runtime"))
-            logger.info(f"✓ Saved runtime graph to {runtime_file}")
-        except (OSError, IOError) as e:
-            raise PackageProcessingError(f"Failed to save runtime graph: {e}") from e
-
-        # Save build graph using atomic write
-        logger.info("Saving build graph...")
-        build_file = output_path / "build_graph.json"
-        try:
-            with safe_write(build_file, mode="w", encoding="utf-8", atomic=True) as f:
-                f.write(build_graph.export_to_json(graph_type="build"))
-            logger.info(f"✓ Saved build graph to {build_file}")
-        except (OSError, IOError) as e:
-            raise PackageProcessingError(f"Failed to save build graph: {e}") from e
+        for graph_type, graph in (("runtime", runtime_graph), ("build", build_graph)):
+            # Save graph using atomic write
+            logger.info("Saving %s graph...", graph_type)
+            plain_file = output_path / f"{graph_type}_graph.json"
+            compressed_file = output_path / f"{graph_type}_graph.json.zst"
+            graph_file, stale_file = (
+                (compressed_file, plain_file) if compress else (plain_file, compressed_file)
+            )
+            try:
+                _write_graph_file(graph_file, graph, graph_type, compress)
+                # Don't leave an older copy in the other format behind
+                if stale_file.exists():
+                    stale_file.unlink()
+                logger.info("✓ Saved %s graph to %s", graph_type, graph_file)
+            except (OSError, IOError) as e:
+                raise PackageProcessingError(f"Failed to save {graph_type} graph: {e}") from e
 
         # Save summary statistics
         logger.info("Generating summary statistics...")
@@ -351,22 +398,22 @@ def save_graphs(
             "runtime_graph": {
                 "nodes": runtime_graph.node_count(),
                 "edges": runtime_graph.edge_count(),
-                "cycles": len(runtime_graph.detect_cycles()),
+                "cycles": runtime_graph.count_cycles(),
             },
             "build_graph": {
                 "nodes": build_graph.node_count(),
                 "edges": build_graph.edge_count(),
-                "cycles": len(build_graph.detect_cycles()),
+                "cycles": build_graph.count_cycles(),
             },
         }
 
         summary_file = output_path / "graph_summary.json"
         try:
-            with safe_write(summary_file, mode="w", encoding="utf-8", atomic=True) as f:
-                json.dump(summary, f, indent=2)
-            logger.info(f"✓ Saved graph summary to {summary_file}")
+            with safe_write(summary_file, mode="wb", atomic=True) as f:
+                f.write(dumps_json(summary, indent=True))
+            logger.info("✓ Saved graph summary to %s", summary_file)
         except (OSError, IOError) as e:
-            logger.warning(f"Failed to save summary file: {e}")
+            logger.warning("Failed to save summary file: %s", e)
             # Don't fail the entire operation if summary can't be saved
 
         logger.info("All graphs saved successfully")
@@ -374,7 +421,7 @@ def save_graphs(
     except PackageProcessingError:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error while saving graphs: {e}", exc_info=True)
+        logger.error("Unexpected error while saving graphs: %s", e, exc_info=True)
         raise PackageProcessingError(f"Failed to save graphs: {e}") from e
 
 
@@ -398,14 +445,17 @@ def clear_cache(cache_dir: str = "data/cache") -> None:
     error_count = 0
 
     try:
-        for file_path in cache_path.glob("*"):
-            if file_path.is_file():
-                try:
-                    file_path.unlink()
-                    removed_count += 1
-                except (OSError, IOError) as e:
-                    error_count += 1
-                    logger.warning(f"Failed to remove {file_path}: {e}")
+        # scandir() reports the file type from the directory listing itself,
+        # so each entry costs a single unlink() rather than stat + unlink
+        with os.scandir(cache_path) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    try:
+                        os.unlink(entry.path)
+                        removed_count += 1
+                    except (OSError, IOError) as e:
+                        error_count += 1
+                        logger.warning(f"Failed to remove {entry.path}: {e}")
 
         if error_count > 0:
             logger.warning(f"Cleared {removed_count} files with {error_count} errors")
@@ -416,10 +466,34 @@ def clear_cache(cache_dir: str = "data/cache") -> None:
         logger.error(f"Error while clearing cache: {e}", exc_info=True)
 
 
-def main() -> int:
+def _record_phase(progress_file: Optional[str], phase: str, started: float) -> float:
+    """
+    Append a phase timing record to the progress file as one JSON line.
+
+    Args:
+        progress_file: Path of the JSON-lines progress file (None to skip recording)
+        phase: Workflow phase that just finished ("download", "parse", "build", "save")
+        started: time.perf_counter() value taken when the phase started
+
+    Returns:
+        Current time.perf_counter() value, the start of the next phase
+    """
+    now = time.perf_counter()
+    if progress_file is not None:
+        record = {"phase": phase, "elapsed": round(now - started, 3), "ts": time.time()}
+        with open(progress_file, "ab") as f:
+            f.write(dumps_json(record) + b"\n")
+    return now
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """
     Main entry point for the RPM Dependency Graph system.
 
+    Args:
+        argv: Command-line arguments without the program name
+            (default: sys.argv[1:]), so the workflow can be run in-process
+
     Returns:
         Exit code (0 for success, non-zero for failure)
     """
@@ -472,6 +546,12 @@ Examples:
         help="Download RPM files and extract dependencies (slow but accurate)",
     )
 
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write zstd-compressed graph files (*_graph.json.zst)",
+    )
+
     parser.add_argument(
         "--max-packages",
         type=int,
@@ -479,7 +559,14 @@ Examples:
         help="Maximum number of packages to process (for testing)",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--progress-file",
+        type=str,
+        default=None,
+        help="Write per-phase timings to this file as JSON lines (overwritten)",
+    )
+
+    args = parser.parse_args(argv)
 
     # Set up logging
     try:
@@ -492,21 +579,26 @@ Examples:
     try:
         args.repo_url = validate_url(args.repo_url, allowed_schemes=["http", "https"])
     except ValidationError as e:
-        logger.error(f"Invalid repository URL: {e}")
+        logger.error("Invalid repository URL: %s", e)
         return 1
 
     logger.info("=" * 70)
     logger.info("RPM Dependency Graph System")
     logger.info("=" * 70)
-    logger.info(f"Repository URL: {args.repo_url}")
-    logger.info(f"Cache directory: {args.cache_dir}")
-    logger.info(f"Output directory: {args.output_dir}")
-    logger.info(f"Verbose mode: {args.verbose}")
+    logger.info("Repository URL: %s", args.repo_url)
+    logger.info("Cache directory: %s", args.cache_dir)
+    logger.info("Output directory: %s", args.output_dir)
+    logger.info("Verbose mode: %s", args.verbose)
     logger.info("=" * 70)
 
     start_time = time.time()
 
     try:
+        if args.progress_file is not None:
+            # Start each run with an empty file; _record_phase() appends to it
+            open(args.progress_file, "w").close()
+        phase_start = time.perf_counter()
+
         # Clear cache if requested
         if args.clear_cache:
             logger.info("\n[1/5] Clearing cache...")
@@ -521,21 +613,23 @@ Examples:
                 args.repo_url, args.cache_dir, args.extract_deps, args.max_packages
             )
         except RepositoryDownloadError as e:
-            logger.error(f"Failed to download repository: {e}")
+            logger.error("Failed to download repository: %s", e)
             logger.info("Tip: Check your internet connection and repository URL")
             return 1
+        phase_start = _record_phase(args.progress_file, "download", phase_start)
 
         if not package_list:
             logger.error("No packages found in repository")
             return 1
 
         # Step 2: Parse packages
-        logger.info(f"\n[3/5] Parsing package information ({len(package_list)} packages)...")
+        logger.info("\n[3/5] Parsing package information (%d packages)...", len(package_list))
         try:
             packages_with_deps = parse_packages(package_list)
         except PackageProcessingError as e:
-            logger.error(f"Failed to parse packages: {e}")
+            logger.error("Failed to parse packages: %s", e)
             return 1
+        phase_start = _record_phase(args.progress_file, "parse", phase_start)
 
         if not packages_with_deps:
             logger.error("No packages were successfully parsed")
@@ -546,16 +640,18 @@ Examples:
         try:
             runtime_graph, build_graph = build_dependency_graphs(packages_with_deps)
         except PackageProcessingError as e:
-            logger.error(f"Failed to build graphs: {e}")
+            logger.error("Failed to build graphs: %s", e)
             return 1
+        phase_start = _record_phase(args.progress_file, "build", phase_start)
 
         # Step 4: Save graphs to JSON files
         logger.info("\n[5/5] Saving graphs to files...")
         try:
-            save_graphs(runtime_graph, build_graph, args.output_dir)
+            save_graphs(runtime_graph, build_graph, args.output_dir, compress=args.compress)
         except PackageProcessingError as e:
-            logger.error(f"Failed to save graphs: {e}")
+            logger.error("Failed to save graphs: %s", e)
             return 1
+        _record_phase(args.progress_file, "save", phase_start)
 
         # Calculate elapsed time
         elapsed_time = time.time() - start_time
@@ -566,13 +662,15 @@ Examples:
         logger.info("✓ Processing complete!")
         logger.info("=" * 70)
         logger.info(
-            f"Runtime graph: {runtime_graph.node_count()} nodes, {runtime_graph.edge_count()} edges"
+            "Runtime graph: %d nodes, %d edges",
+            runtime_graph.node_count(),
+            runtime_graph.edge_count(),
         )
         logger.info(
-            f"Build graph: {build_graph.node_count()} nodes, {build_graph.edge_count()} edges"
+            "Build graph: %d nodes, %d edges", build_graph.node_count(), build_graph.edge_count()
         )
-        logger.info(f"Output directory: {args.output_dir}")
-        logger.info(f"Processing time: {minutes}m {seconds}s")
+        logger.info("Output directory: %s", args.output_dir)
+        logger.info("Processing time: %dm %ds", minutes, seconds)
         logger.info("=" * 70)
 
         return 0
@@ -581,7 +679,7 @@ Examples:
         logger.warning("\n\nOperation cancelled by user")
         return 130  # Standard exit code for SIGINT
     except Exception as e:
-        logger.error(f"\n\nUnexpected error: {e}", exc_info=True)
+        logger.error("\n\nUnexpected error: %s", e, exc_info=True)
         logger.error("Please check the log file for details")
         return 1
 
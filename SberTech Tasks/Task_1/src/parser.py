@@ -3,10 +3,12 @@ RPM package parser module for extracting metadata and dependencies from RPM file
 """
 
 import logging
+import mmap
 import struct
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from src.validation import (
     validate_file_path,
@@ -18,8 +20,18 @@ from src.validation import (
 
 logger = logging.getLogger(__name__)
 
+# RPM header index entry: tag, type, offset, count (big-endian uint32 each)
+_INDEX_ENTRY = struct.Struct(">IIII")
+# RPM header intro after magic and reserved bytes: index count, data size
+_HEADER_SIZES = struct.Struct(">II")
 
-@dataclass
+# Record dataclasses created once per package/dependency (here and in
+# src.repository) are slotted to drop the per-instance __dict__
+# (dataclass slots= needs 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class PackageMetadata:
     """Represents metadata extracted from an RPM package"""
 
@@ -30,7 +42,7 @@ class PackageMetadata:
     is_source: bool
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Dependency:
     """Represents a dependency relationship"""
 
@@ -69,6 +81,8 @@ class RPMParser:
     def __init__(self):
         """Initialize the RPM parser"""
         self.use_rpm_library = self._check_rpm_library()
+        # rpm.TransactionSet shared by every header read, created on first use
+        self._ts = None
 
     def _check_rpm_library(self) -> bool:
         """
@@ -98,17 +112,86 @@ class RPMParser:
         Raises:
             RPMParsingError: If parsing fails
         """
-        # Validate file path and size
+        self._validate_rpm_path(rpm_path)
+
+        if self.use_rpm_library:
+            return self._parse_with_rpm_library(rpm_path)
+        else:
+            return self._parse_manually(rpm_path)
+
+    def parse_rpm_full(self, rpm_path: Path) -> Tuple[PackageMetadata, List[Dependency]]:
+        """
+        Extract package metadata and dependencies from an RPM in one pass.
+
+        Equivalent to calling parse_rpm_header() and extract_dependencies(),
+        but the file is validated, opened and its header parsed only once.
+
+        Args:
+            rpm_path: Path to the RPM file
+
+        Returns:
+            Tuple of (PackageMetadata, List[Dependency])
+
+        Raises:
+            RPMParsingError: If parsing fails
+        """
+        self._validate_rpm_path(rpm_path)
+
+        if self.use_rpm_library:
+            try:
+                header = self._read_header_with_rpm_library(rpm_path)
+                return self._metadata_from_rpm_header(header), self._deps_from_rpm_header(header)
+            except Exception as e:
+                raise RPMParsingError(f"Failed to parse RPM with rpm library: {e}")
+
+        try:
+            header_data = self._load_header_manually(rpm_path)
+            return (
+                self._metadata_from_header_data(header_data),
+                self._deps_from_header_data(header_data),
+            )
+        except RPMParsingError:
+            raise
+        except Exception as e:
+            raise RPMParsingError(f"Failed to parse RPM manually: {e}")
+
+    def _validate_rpm_path(self, rpm_path: Path) -> None:
+        """
+        Check that an RPM file exists and is within the size limit.
+
+        Args:
+            rpm_path: Path to the RPM file
+
+        Raises:
+            RPMParsingError: If the path or file size is invalid
+        """
         try:
             validate_file_path(str(rpm_path), must_exist=True)
             validate_file_size(rpm_path, max_size_mb=500)  # RPM files can be large
         except ValidationError as e:
             raise RPMParsingError(f"Invalid RPM file: {e}")
 
-        if self.use_rpm_library:
-            return self._parse_with_rpm_library(rpm_path)
-        else:
-            return self._parse_manually(rpm_path)
+    def _read_header_with_rpm_library(self, rpm_path: Path):
+        """
+        Read the main header of an RPM using the rpm Python library.
+
+        The transaction set is created once per parser and reused, since
+        setting one up is much more expensive than reading a header.
+
+        Args:
+            rpm_path: Path to the RPM file
+
+        Returns:
+            rpm header object
+        """
+        import rpm
+
+        if self._ts is None:
+            self._ts = rpm.TransactionSet()
+            self._ts.setVSFlags(rpm._RPMVSF_NOSIGNATURES)  # Skip signature verification
+
+        with open(rpm_path, "rb") as f:
+            return self._ts.hdrFromFdno(f.fileno())
 
     def _parse_with_rpm_library(self, rpm_path: Path) -> PackageMetadata:
         """
@@ -124,56 +207,64 @@ class RPMParser:
             RPMParsingError: If parsing fails
         """
         try:
-            import rpm
+            header = self._read_header_with_rpm_library(rpm_path)
+            return self._metadata_from_rpm_header(header)
+        except Exception as e:
+            raise RPMParsingError(f"Failed to parse RPM with rpm library: {e}")
 
-            # Open RPM file
-            ts = rpm.TransactionSet()
-            ts.setVSFlags(rpm._RPMVSF_NOSIGNATURES)  # Skip signature verification
+    def _metadata_from_rpm_header(self, header) -> PackageMetadata:
+        """
+        Build package metadata from a header read by the rpm library.
 
-            with open(rpm_path, "rb") as f:
-                header = ts.hdrFromFdno(f.fileno())
+        Args:
+            header: rpm header object
 
-            # Extract metadata
-            name = (
-                header[rpm.RPMTAG_NAME].decode()
-                if isinstance(header[rpm.RPMTAG_NAME], bytes)
-                else header[rpm.RPMTAG_NAME]
-            )
-            version = (
-                header[rpm.RPMTAG_VERSION].decode()
-                if isinstance(header[rpm.RPMTAG_VERSION], bytes)
-                else header[rpm.RPMTAG_VERSION]
-            )
-            release = (
-                header[rpm.RPMTAG_RELEASE].decode()
-                if isinstance(header[rpm.RPMTAG_RELEASE], bytes)
-                else header[rpm.RPMTAG_RELEASE]
-            )
-            arch = (
-                header[rpm.RPMTAG_ARCH].decode()
-                if isinstance(header[rpm.RPMTAG_ARCH], bytes)
-                else header[rpm.RPMTAG_ARCH]
-            )
+        Returns:
+            PackageMetadata object
 
-            # Validate extracted metadata
-            try:
-                name = validate_package_name(name)
-                version = validate_metadata_string(version, "version", max_length=128)
-                release = validate_metadata_string(release, "release", max_length=128)
-                arch = validate_metadata_string(arch, "architecture", max_length=64)
-            except ValidationError as e:
-                raise RPMParsingError(f"Invalid metadata in RPM: {e}")
-
-            # Determine if source package
-            source_rpm = header.get(rpm.RPMTAG_SOURCERPM)
-            is_source = source_rpm is None or arch in ("src", "nosrc")
-
-            return PackageMetadata(
-                name=name, version=version, release=release, arch=arch, is_source=is_source
-            )
+        Raises:
+            RPMParsingError: If the metadata is invalid
+        """
+        import rpm
+
+        # Extract metadata
+        name = (
+            header[rpm.RPMTAG_NAME].decode()
+            if isinstance(header[rpm.RPMTAG_NAME], bytes)
+            else header[rpm.RPMTAG_NAME]
+        )
+        version = (
+            header[rpm.RPMTAG_VERSION].decode()
+            if isinstance(header[rpm.RPMTAG_VERSION], bytes)
+            else header[rpm.RPMTAG_VERSION]
+        )
+        release = (
+            header[rpm.RPMTAG_RELEASE].decode()
+            if isinstance(header[rpm.RPMTAG_RELEASE], bytes)
+            else header[rpm.RPMTAG_RELEASE]
+        )
+        arch = (
+            header[rpm.RPMTAG_ARCH].decode()
+            if isinstance(header[rpm.RPMTAG_ARCH], bytes)
+            else header[rpm.RPMTAG_ARCH]
+        )
+
+        # Validate extracted metadata
+        try:
+            name = sys.intern(validate_package_name(name))
+            version = validate_metadata_string(version, "version", max_length=128)
+            release = validate_metadata_string(release, "release", max_length=128)
+            arch = validate_metadata_string(arch, "architecture", max_length=64)
+        except ValidationError as e:
+            raise RPMParsingError(f"Invalid metadata in RPM: {e}")
 
-        except Exception as e:
-            raise RPMParsingError(f"Failed to parse RPM with rpm library: {e}")
+        # Determine if source package
+        source_rpm = header.get(rpm.RPMTAG_SOURCERPM)
+        is_source = source_rpm is None or arch in ("src", "nosrc")
+
+        return PackageMetadata(
+            name=name, version=version, release=release, arch=arch, is_source=is_source
+        )
 
     def _parse_manually(self, rpm_path: Path) -> PackageMetadata:
         """
@@ -189,130 +280,145 @@ class RPMParser:
             RPMParsingError: If parsing fails
         """
         try:
-            with open(rpm_path, "rb") as f:
-                # Read and verify lead (96 bytes)
-                lead = f.read(96)
-                if len(lead) < 96:
-                    raise RPMParsingError("Invalid RPM file: too short")
-
-                if lead[:4] != self.RPM_LEAD_MAGIC:
-                    raise RPMParsingError("Invalid RPM file: bad magic number")
-
-                # Skip signature header
-                self._skip_header(f)
-
-                # Parse main header
-                header_data = self._read_header(f)
-
-                # Extract metadata from header
-                name = self._get_header_string(header_data, self.TAG_NAME)
-                version = self._get_header_string(header_data, self.TAG_VERSION)
-                release = self._get_header_string(header_data, self.TAG_RELEASE)
-                arch = self._get_header_string(header_data, self.TAG_ARCH)
-                source_rpm = self._get_header_string(header_data, self.TAG_SOURCERPM)
-
-                if not all([name, version, release, arch]):
-                    raise RPMParsingError("Missing required metadata fields")
-
-                # Validate extracted metadata (type narrowing - not None after check)
-                assert (
-                    name is not None
-                    and version is not None
-                    and release is not None
-                    and arch is not None
-                )
-                try:
-                    name = validate_package_name(name)
-                    version = validate_metadata_string(version, "version", max_length=128)
-                    release = validate_metadata_string(release, "release", max_length=128)
-                    arch = validate_metadata_string(arch, "architecture", max_length=64)
-                except ValidationError as e:
-                    raise RPMParsingError(f"Invalid metadata in RPM: {e}")
-
-                # Determine if source package
-                is_source = source_rpm is None or arch in ("src", "nosrc")
-
-                return PackageMetadata(
-                    name=name, version=version, release=release, arch=arch, is_source=is_source
-                )
-
+            return self._metadata_from_header_data(self._load_header_manually(rpm_path))
         except RPMParsingError:
             raise
         except Exception as e:
             raise RPMParsingError(f"Failed to parse RPM manually: {e}")
 
-    def _skip_header(self, f) -> None:
+    def _load_header_manually(self, rpm_path: Path) -> Dict[int, Any]:
+        """
+        Read the main header of an RPM file without the rpm library.
+
+        Args:
+            rpm_path: Path to the RPM file
+
+        Returns:
+            Dictionary mapping tag IDs to their values
+
+        Raises:
+            RPMParsingError: If the file is not a valid RPM
+        """
+        with open(rpm_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            # Verify lead (96 bytes)
+            if len(mm) < 96:
+                raise RPMParsingError("Invalid RPM file: too short")
+
+            if mm[:4] != self.RPM_LEAD_MAGIC:
+                raise RPMParsingError("Invalid RPM file: bad magic number")
+
+            # Skip signature header
+            pos = self._skip_header(mm, 96)
+
+            # Parse main header
+            return self._read_header(mm, pos)
+
+    def _metadata_from_header_data(self, header_data: Dict[int, Any]) -> PackageMetadata:
+        """
+        Build package metadata from a manually parsed header.
+
+        Args:
+            header_data: Parsed header dictionary
+
+        Returns:
+            PackageMetadata object
+
+        Raises:
+            RPMParsingError: If required fields are missing or invalid
+        """
+        # Extract metadata from header
+        name = self._get_header_string(header_data, self.TAG_NAME)
+        version = self._get_header_string(header_data, self.TAG_VERSION)
+        release = self._get_header_string(header_data, self.TAG_RELEASE)
+        arch = self._get_header_string(header_data, self.TAG_ARCH)
+        source_rpm = self._get_header_string(header_data, self.TAG_SOURCERPM)
+
+        if not all([name, version, release, arch]):
+            raise RPMParsingError("Missing required metadata fields")
+
+        # Validate extracted metadata (type narrowing - not None after check)
+        assert (
+            name is not None
+            and version is not None
+            and release is not None
+            and arch is not None
+        )
+        try:
+            name = validate_package_name(name)
+            version = validate_metadata_string(version, "version", max_length=128)
+            release = validate_metadata_string(release, "release", max_length=128)
+            arch = validate_metadata_string(arch, "architecture", max_length=64)
+        except ValidationError as e:
+            raise RPMParsingError(f"Invalid metadata in RPM: {e}")
+
+        # Determine if source package
+        is_source = source_rpm is None or arch in ("src", "nosrc")
+
+        return PackageMetadata(
+            name=name, version=version, release=release, arch=arch, is_source=is_source
+        )
+
+    def _skip_header(self, buf, pos: int) -> int:
         """
         Skip over an RPM header section.
 
         Args:
-            f: File object positioned at start of header
+            buf: Buffer (e.g. memory-mapped file) holding the RPM file
+            pos: Offset of the start of the header
+
+        Returns:
+            Offset of the first byte after the header, aligned to 8 bytes
         """
-        # Read header magic and reserved bytes (8 bytes)
-        header_intro = f.read(8)
-        if len(header_intro) < 8:
+        # Header magic and reserved bytes (8 bytes), then index count and data size
+        if len(buf) < pos + 8:
             raise RPMParsingError("Invalid header: too short")
-
-        # Read index count and data size (8 bytes)
-        index_info = f.read(8)
-        if len(index_info) < 8:
+        if len(buf) < pos + 16:
             raise RPMParsingError("Invalid header: missing index info")
 
-        index_count = struct.unpack(">I", index_info[:4])[0]
-        data_size = struct.unpack(">I", index_info[4:])[0]
+        index_count, data_size = _HEADER_SIZES.unpack_from(buf, pos + 8)
 
         # Skip index entries (16 bytes each) and data
-        skip_size = (index_count * 16) + data_size
-        f.seek(skip_size, 1)
+        pos += 16 + (index_count * 16) + data_size
 
         # Align to 8-byte boundary
-        pos = f.tell()
-        alignment = (8 - (pos % 8)) % 8
-        if alignment:
-            f.seek(alignment, 1)
+        return pos + (8 - (pos % 8)) % 8
 
-    def _read_header(self, f) -> Dict[int, Any]:
+    def _read_header(self, buf, pos: int) -> Dict[int, Any]:
         """
         Read and parse an RPM header section.
 
         Args:
-            f: File object positioned at start of header
+            buf: Buffer (e.g. memory-mapped file) holding the RPM file
+            pos: Offset of the start of the header
 
         Returns:
             Dictionary mapping tag IDs to their values
         """
-        # Read header magic and reserved bytes (8 bytes)
-        header_intro = f.read(8)
-        if len(header_intro) < 8:
+        # Header magic and reserved bytes (8 bytes), then index count and data size
+        if len(buf) < pos + 8:
             raise RPMParsingError("Invalid header: too short")
-
-        # Read index count and data size (8 bytes)
-        index_info = f.read(8)
-        if len(index_info) < 8:
+        if len(buf) < pos + 16:
             raise RPMParsingError("Invalid header: missing index info")
 
-        index_count = struct.unpack(">I", index_info[:4])[0]
-        data_size = struct.unpack(">I", index_info[4:])[0]
+        index_count, data_size = _HEADER_SIZES.unpack_from(buf, pos + 8)
 
-        # Read index entries
-        index_data = f.read(index_count * 16)
-        if len(index_data) < index_count * 16:
+        # Index entries
+        index_start = pos + 16
+        index_end = index_start + index_count * 16
+        if len(buf) < index_end:
             raise RPMParsingError("Invalid header: incomplete index")
+        index_data = buf[index_start:index_end]
 
-        # Read data store
-        store_data = f.read(data_size)
+        # Data store
+        store_data = buf[index_end : index_end + data_size]
         if len(store_data) < data_size:
             raise RPMParsingError("Invalid header: incomplete data store")
 
-        # Parse index entries
+        # Parse index entries (one C-level unpack per 16-byte entry)
         header_dict = {}
-        for i in range(index_count):
-            offset = i * 16
-            tag = struct.unpack(">I", index_data[offset : offset + 4])[0]
-            data_type = struct.unpack(">I", index_data[offset + 4 : offset + 8])[0]
-            data_offset = struct.unpack(">I", index_data[offset + 8 : offset + 12])[0]
-            count = struct.unpack(">I", index_data[offset + 12 : offset + 16])[0]
-
+        for tag, data_type, data_offset, count in _INDEX_ENTRY.iter_unpack(index_data):
             header_dict[tag] = {
                 "type": data_type,
                 "offset": data_offset,
@@ -346,9 +452,12 @@ class RPMParser:
             end = len(data)
 
         try:
-            return data[offset:end].decode("utf-8")
+            value = data[offset:end].decode("utf-8")
         except UnicodeDecodeError:
-            return data[offset:end].decode("latin-1")
+            value = data[offset:end].decode("latin-1")
+
+        # Names, versions and arches repeat across packages; share one copy
+        return sys.intern(value)
 
     def extract_dependencies(self, rpm_path: Path) -> List[Dependency]:
         """
@@ -363,12 +472,7 @@ class RPMParser:
         Raises:
             RPMParsingError: If extraction fails
         """
-        # Validate file path and size
-        try:
-            validate_file_path(str(rpm_path), must_exist=True)
-            validate_file_size(rpm_path, max_size_mb=500)
-        except ValidationError as e:
-            raise RPMParsingError(f"Invalid RPM file: {e}")
+        self._validate_rpm_path(rpm_path)
 
         if self.use_rpm_library:
             return self._extract_deps_with_rpm_library(rpm_path)
@@ -389,79 +493,86 @@ class RPMParser:
             RPMParsingError: If extraction fails
         """
         try:
-            import rpm
-
-            # Open RPM file
-            ts = rpm.TransactionSet()
-            ts.setVSFlags(rpm._RPMVSF_NOSIGNATURES)
-
-            with open(rpm_path, "rb") as f:
-                header = ts.hdrFromFdno(f.fileno())
-
-            dependencies = []
-
-            # Extract Requires dependencies
-            requires_names = header.get(rpm.RPMTAG_REQUIRENAME, [])
-            requires_flags = header.get(rpm.RPMTAG_REQUIREFLAGS, [])
-            requires_versions = header.get(rpm.RPMTAG_REQUIREVERSION, [])
-
-            for i, name in enumerate(requires_names):
-                dep_name = name.decode() if isinstance(name, bytes) else name
-                dep_flags = requires_flags[i] if i < len(requires_flags) else 0
-                dep_version = None
-                if i < len(requires_versions):
-                    ver = requires_versions[i]
-                    dep_version = ver.decode() if isinstance(ver, bytes) else ver
-
-                dependencies.append(
-                    Dependency(
-                        name=dep_name,
-                        version=dep_version if dep_version else None,
-                        flags=dep_flags,
-                        type="requires",
-                    )
-                )
+            header = self._read_header_with_rpm_library(rpm_path)
+            return self._deps_from_rpm_header(header)
+        except Exception as e:
+            raise RPMParsingError(f"Failed to extract dependencies with rpm library: {e}")
+
+    def _deps_from_rpm_header(self, header) -> List[Dependency]:
+        """
+        Build the dependency list from a header read by the rpm library.
 
-            # Extract Provides information
-            provides_names = header.get(rpm.RPMTAG_PROVIDENAME, [])
-            provides_flags = header.get(rpm.RPMTAG_PROVIDEFLAGS, [])
-            provides_versions = header.get(rpm.RPMTAG_PROVIDEVERSION, [])
-
-            for i, name in enumerate(provides_names):
-                dep_name = name.decode() if isinstance(name, bytes) else name
-                dep_flags = provides_flags[i] if i < len(provides_flags) else 0
-                dep_version = None
-                if i < len(provides_versions):
-                    ver = provides_versions[i]
-                    dep_version = ver.decode() if isinstance(ver, bytes) else ver
-
-                dependencies.append(
-                    Dependency(
-                        name=dep_name,
-                        version=dep_version if dep_version else None,
-                        flags=dep_flags,
-                        type="provides",
-                    )
+        Args:
+            header: rpm header object
+
+        Returns:
+            List of Dependency objects
+        """
+        import rpm
+
+        dependencies = []
+
+        # Extract Requires dependencies
+        requires_names = header.get(rpm.RPMTAG_REQUIRENAME, [])
+        requires_flags = header.get(rpm.RPMTAG_REQUIREFLAGS, [])
+        requires_versions = header.get(rpm.RPMTAG_REQUIREVERSION, [])
+
+        for i, name in enumerate(requires_names):
+            # The same names recur in most packages; share one copy
+            dep_name = sys.intern(name.decode() if isinstance(name, bytes) else name)
+            dep_flags = requires_flags[i] if i < len(requires_flags) else 0
+            dep_version = None
+            if i < len(requires_versions):
+                ver = requires_versions[i]
+                dep_version = ver.decode() if isinstance(ver, bytes) else ver
+
+            dependencies.append(
+                Dependency(
+                    name=dep_name,
+                    version=dep_version if dep_version else None,
+                    flags=dep_flags,
+                    type="requires",
                 )
+            )
 
-            # For source RPMs, try to extract BuildRequires
-            # Note: BuildRequires may not always be in the header
-            source_rpm = header.get(rpm.RPMTAG_SOURCERPM)
-            arch = header[rpm.RPMTAG_ARCH]
-            arch_str = arch.decode() if isinstance(arch, bytes) else arch
-            is_source = source_rpm is None or arch_str in ("src", "nosrc")
+        # Extract Provides information
+        provides_names = header.get(rpm.RPMTAG_PROVIDENAME, [])
+        provides_flags = header.get(rpm.RPMTAG_PROVIDEFLAGS, [])
+        provides_versions = header.get(rpm.RPMTAG_PROVIDEVERSION, [])
+
+        for i, name in enumerate(provides_names):
+            # The same names recur in most packages; share one copy
+            dep_name = sys.intern(name.decode() if isinstance(name, bytes) else name)
+            dep_flags = provides_flags[i] if i < len(provides_flags) else 0
+            dep_version = None
+            if i < len(provides_versions):
+                ver = provides_versions[i]
+                dep_version = ver.decode() if isinstance(ver, bytes) else ver
+
+            dependencies.append(
+                Dependency(
+                    name=dep_name,
+                    version=dep_version if dep_version else None,
+                    flags=dep_flags,
+                    type="provides",
+                )
+            )
 
-            if is_source:
-                # BuildRequires are typically stored as regular Requires in SRPMs
-                # Mark them as buildrequires based on context
-                for dep in dependencies:
-                    if dep.type == "requires":
-                        dep.type = "buildrequires"
+        # For source RPMs, try to extract BuildRequires
+        # Note: BuildRequires may not always be in the header
+        source_rpm = header.get(rpm.RPMTAG_SOURCERPM)
+        arch = header[rpm.RPMTAG_ARCH]
+        arch_str = arch.decode() if isinstance(arch, bytes) else arch
+        is_source = source_rpm is None or arch_str in ("src", "nosrc")
 
-            return dependencies
+        if is_source:
+            # BuildRequires are typically stored as regular Requires in SRPMs
+            # Mark them as buildrequires based on context
+            for dep in dependencies:
+                if dep.type == "requires":
+                    dep.type = "buildrequires"
 
-        except Exception as e:
-            raise RPMParsingError(f"Failed to extract dependencies with rpm library: {e}")
+        return dependencies
 
     def _extract_deps_manually(self, rpm_path: Path) -> List[Dependency]:
         """
@@ -477,66 +588,65 @@ class RPMParser:
             RPMParsingError: If extraction fails
         """
         try:
-            with open(rpm_path, "rb") as f:
-                # Read and verify lead
-                lead = f.read(96)
-                if len(lead) < 96 or lead[:4] != self.RPM_LEAD_MAGIC:
-                    raise RPMParsingError("Invalid RPM file")
-
-                # Skip signature header
-                self._skip_header(f)
+            return self._deps_from_header_data(self._load_header_manually(rpm_path))
+        except RPMParsingError:
+            raise
+        except Exception as e:
+            raise RPMParsingError(f"Failed to extract dependencies manually: {e}")
 
-                # Parse main header
-                header_data = self._read_header(f)
+    def _deps_from_header_data(self, header_data: Dict[int, Any]) -> List[Dependency]:
+        """
+        Build the dependency list from a manually parsed header.
 
-                dependencies = []
+        Args:
+            header_data: Parsed header dictionary
 
-                # Extract Requires dependencies
-                requires_names = self._get_header_string_array(header_data, self.TAG_REQUIRENAME)
-                requires_flags = self._get_header_int_array(header_data, self.TAG_REQUIREFLAGS)
-                requires_versions = self._get_header_string_array(
-                    header_data, self.TAG_REQUIREVERSION
-                )
+        Returns:
+            List of Dependency objects
+        """
+        dependencies = []
 
-                for i, name in enumerate(requires_names):
-                    flags = requires_flags[i] if i < len(requires_flags) else 0
-                    version = requires_versions[i] if i < len(requires_versions) else None
+        # Extract Requires dependencies
+        requires_names = self._get_header_string_array(header_data, self.TAG_REQUIRENAME)
+        requires_flags = self._get_header_int_array(header_data, self.TAG_REQUIREFLAGS)
+        requires_versions = self._get_header_string_array(
+            header_data, self.TAG_REQUIREVERSION
+        )
 
-                    dependencies.append(
-                        Dependency(name=name, version=version, flags=flags, type="requires")
-                    )
+        for i, name in enumerate(requires_names):
+            flags = requires_flags[i] if i < len(requires_flags) else 0
+            version = requires_versions[i] if i < len(requires_versions) else None
 
-                # Extract Provides information
-                provides_names = self._get_header_string_array(header_data, self.TAG_PROVIDENAME)
-                provides_flags = self._get_header_int_array(header_data, self.TAG_PROVIDEFLAGS)
-                provides_versions = self._get_header_string_array(
-                    header_data, self.TAG_PROVIDEVERSION
-                )
+            dependencies.append(
+                Dependency(name=name, version=version, flags=flags, type="requires")
+            )
 
-                for i, name in enumerate(provides_names):
-                    flags = provides_flags[i] if i < len(provides_flags) else 0
-                    version = provides_versions[i] if i < len(provides_versions) else None
+        # Extract Provides information
+        provides_names = self._get_header_string_array(header_data, self.TAG_PROVIDENAME)
+        provides_flags = self._get_header_int_array(header_data, self.TAG_PROVIDEFLAGS)
+        provides_versions = self._get_header_string_array(
+            header_data, self.TAG_PROVIDEVERSION
+        )
 
-                    dependencies.append(
-                        Dependency(name=name, version=version, flags=flags, type="provides")
-                    )
+        for i, name in enumerate(provides_names):
+            flags = provides_flags[i] if i < len(provides_flags) else 0
+            version = provides_versions[i] if i < len(provides_versions) else None
 
-                # Check if source package and mark requires as buildrequires
-                arch = self._get_header_string(header_data, self.TAG_ARCH)
-                source_rpm = self._get_header_string(header_data, self.TAG_SOURCERPM)
-                is_source = source_rpm is None or arch in ("src", "nosrc")
+            dependencies.append(
+                Dependency(name=name, version=version, flags=flags, type="provides")
+            )
 
-                if is_source:
-                    for dep in dependencies:
-                        if dep.type == "requires":
-                            dep.type = "buildrequires"
+        # Check if source package and mark requires as buildrequires
+        arch = self._get_header_string(header_data, self.TAG_ARCH)
+        source_rpm = self._get_header_string(header_data, self.TAG_SOURCERPM)
+        is_source = source_rpm is None or arch in ("src", "nosrc")
 
-                return dependencies
+        if is_source:
+            for dep in dependencies:
+                if dep.type == "requires":
+                    dep.type = "buildrequires"
 
-        except RPMParsingError:
-            raise
-        except Exception as e:
-            raise RPMParsingError(f"Failed to extract dependencies manually: {e}")
+        return dependencies
 
     def _get_header_string_array(self, header_data: Dict[int, Any], tag: int) -> List[str]:
         """
@@ -557,22 +667,22 @@ class RPMParser:
         count = entry["count"]
         data = entry["data"]
 
-        strings = []
-        current_offset = offset
+        # Split the NUL-terminated run in one call; the last part is whatever
+        # follows the count-th terminator (or an unterminated tail) and is dropped
+        parts = data[offset:].split(b"\x00", count)[:-1]
 
-        for _ in range(count):
-            # Find null terminator
-            end = data.find(b"\x00", current_offset)
-            if end == -1:
-                break
-
-            try:
-                string_val = data[current_offset:end].decode("utf-8")
-            except UnicodeDecodeError:
-                string_val = data[current_offset:end].decode("latin-1")
+        strings = []
+        for part in parts:
+            if part.isascii():
+                string_val = part.decode("ascii")
+            else:
+                try:
+                    string_val = part.decode("utf-8")
+                except UnicodeDecodeError:
+                    string_val = part.decode("latin-1")
 
-            strings.append(string_val)
-            current_offset = end + 1
+            # Dependency names repeat across packages; share one copy of each
+            strings.append(sys.intern(string_val))
 
         return strings
 
@@ -596,21 +706,18 @@ class RPMParser:
         data = entry["data"]
         data_type = entry["type"]
 
-        integers = []
-
-        # Type 4 = INT32
+        # Type 4 = INT32, type 3 = INT16
         if data_type == 4:
-            for i in range(count):
-                int_offset = offset + (i * 4)
-                if int_offset + 4 <= len(data):
-                    int_val = struct.unpack(">I", data[int_offset : int_offset + 4])[0]
-                    integers.append(int_val)
-        # Type 3 = INT16
+            width, code = 4, "I"
         elif data_type == 3:
-            for i in range(count):
-                int_offset = offset + (i * 2)
-                if int_offset + 2 <= len(data):
-                    int_val = struct.unpack(">H", data[int_offset : int_offset + 2])[0]
-                    integers.append(int_val)
+            width, code = 2, "H"
+        else:
+            return []
+
+        # Entries starting past the end of the data store are dropped
+        if offset >= len(data):
+            return []
 
-        return integers
+        # Decode the whole array with one unpack, dropping entries past the data store
+        available = min(count, (len(data) - offset) // width)
+        return list(struct.unpack_from(f">{available}{code}", data, offset))
@@ -2,20 +2,43 @@
 Repository downloader module for fetching and parsing RPM repository metadata.
 """
 
+import functools
 import gzip
 import hashlib
+import io
 import logging
-import re
+import multiprocessing
+import os
+import sys
 import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from urllib.parse import urljoin
 from html.parser import HTMLParser
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional; fall back to xml.etree.ElementTree
+    lxml_etree = None
 
+from src.parser import _DATACLASS_SLOTS
 from src.validation import (
     validate_url,
     validate_package_name,
@@ -27,8 +50,124 @@ from src.validation import (
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Errors raised for malformed XML by whichever parser is in use
+XML_PARSE_ERRORS = (ET.ParseError,) + ((lxml_etree.XMLSyntaxError,) if lxml_etree else ())
+
+
+# Largest primary.xml accepted into the cache
+MAX_METADATA_SIZE = 500 * 1024 * 1024
+
+# Buffer size used when streaming generated metadata to the cache
+METADATA_WRITE_BUFFER = 1024 * 1024
+
+# Chunk size used when downloading and decompressing metadata
+READ_BUFFER_SIZE = 128 * 1024
+
+# First two bytes of every gzip stream
+GZIP_MAGIC = b"\x1f\x8b"
+
+# primary.xml namespaces
+COMMON_NS = "http://linux.duke.edu/metadata/common"
+RPM_NS = "http://linux.duke.edu/metadata/rpm"
+
+
+class _PackageTags(NamedTuple):
+    """Fully resolved tag names of the primary.xml elements that are read."""
+
+    package: str
+    name: str
+    version: str
+    arch: str
+    location: str
+    checksum: str
+    format: str
+
+    @classmethod
+    def with_prefix(cls, prefix: str) -> "_PackageTags":
+        return cls(*(prefix + field for field in cls._fields))
+
+
+# Tags with and without the common namespace; picked once per document so each
+# field is a single find() on a plain tag instead of a prefix lookup plus fallback
+_NAMESPACED_TAGS = _PackageTags.with_prefix("{%s}" % COMMON_NS)
+_PLAIN_TAGS = _PackageTags.with_prefix("")
+
+# Dependency list tags inside <format>, with and without the rpm namespace
+_RPM_TAGS = {
+    name: ("{%s}%s" % (RPM_NS, name), name) for name in ("requires", "provides", "entry")
+}
+
+# One <package> entry of generated primary.xml; values are XML-escaped and
+# provides/requires are complete (possibly empty) rpm:provides/rpm:requires elements
+PACKAGE_TEMPLATE = "\n".join([
+    '  <package type="rpm">',
+    '    <name>{name}</name>',
+    '    <arch>{arch}</arch>',
+    '    <version epoch="0" ver="{version}" rel="{release}"/>',
+    '    <checksum type="sha256"></checksum>',
+    '    <summary></summary>',
+    '    <description></description>',
+    '    <packager></packager>',
+    '    <url></url>',
+    '    <time file="0" build="0"/>',
+    '    <size package="0" installed="0" archive="0"/>',
+    '    <location href="{location}"/>',
+    '    <format>',
+    '      <rpm:license></rpm:license>',
+    '      <rpm:vendor></rpm:vendor>',
+    '      <rpm:group></rpm:group>',
+    '      <rpm:buildhost></rpm:buildhost>',
+    '      <rpm:sourcerpm></rpm:sourcerpm>',
+    '{provides}',
+    '{requires}',
+    '    </format>',
+    '  </package>',
+])
+
+# Single-pass translation table for the five XML special characters
+_XML_ESCAPE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&apos;"}
+)
+
+# Number of RPM files downloaded concurrently (also the HTTP connection pool size)
+DOWNLOAD_WORKERS = 16
 
-@dataclass
+# Number of RPM files from which parsing is spread over a process pool
+PARALLEL_PARSE_THRESHOLD = 64
+
+# Per-process parser used by _parse_rpm_worker()
+_worker_parser = None
+
+
+def _init_rpm_worker() -> None:
+    """Create the RPM parser used by _parse_rpm_worker() in this process."""
+    global _worker_parser
+    from src.parser import RPMParser
+
+    if _worker_parser is None:
+        _worker_parser = RPMParser()
+
+
+def _parse_rpm_worker(rpm_path: Path):
+    """
+    Parse one RPM file with the per-process parser.
+
+    Args:
+        rpm_path: Path to the RPM file
+
+    Returns:
+        Tuple of (PackageMetadata, List[Dependency]), or the exception raised
+        so that one broken file does not abort the whole batch
+    """
+    try:
+        return _worker_parser.parse_rpm_full(rpm_path)
+    except Exception as e:
+        return e
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class PackageInfo:
     """Represents a package in the repository"""
 
@@ -55,6 +194,29 @@ class RepositoryDownloadError(Exception):
     pass
 
 
+class _SizeLimitedReader(io.RawIOBase):
+    """Binary stream wrapper that fails once more than a byte limit has been read."""
+
+    def __init__(self, stream: BinaryIO, limit: int):
+        self._stream = stream
+        self._limit = limit
+        self._size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._stream.readinto(buffer)
+        self._size += count
+        if self._size > self._limit:
+            raise RepositoryDownloadError("Metadata file too large (>500MB)")
+        return count
+
+    def close(self) -> None:
+        self._stream.close()
+        super().close()
+
+
 class HTMLDirectoryParser(HTMLParser):
     """Parse HTML directory listing to extract RPM file links"""
 
@@ -87,6 +249,10 @@ class RepositoryDownloader:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "RPM-Dependency-Graph/1.0"})
+        # Keep a connection per download worker instead of the default 10
+        adapter = HTTPAdapter(pool_connections=DOWNLOAD_WORKERS, pool_maxsize=DOWNLOAD_WORKERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def download_repository_metadata(self, repo_url: str, max_retries: int = 3) -> Path:
         """
@@ -151,30 +317,165 @@ class RepositoryDownloader:
         # Parse repomd.xml to find primary.xml.gz location
         primary_location = self._parse_repomd(repomd_data)
 
+        # repomd.xml changes whenever the repository is regenerated, so an
+        # unchanged copy means the cached primary metadata is still current
+        repomd_digest = hashlib.blake2b(repomd_data, digest_size=16).hexdigest()
+        cached_path = self._find_cached_primary(repo_url, primary_location, repomd_digest)
+        if cached_path is not None:
+            logger.info("Repository metadata unchanged, using cached %s", cached_path)
+            return cached_path
+
         # Download primary.xml.gz or primary.xml.zst
         primary_url = urljoin(repo_url, primary_location)
         logger.info(f"Downloading primary metadata from {primary_url}")
 
-        primary_compressed_data = self._download_with_retry(primary_url, max_retries)
+        # Stream the (possibly large) download to disk instead of holding it in memory
+        download_path = self._metadata_cache_path(repo_url).with_suffix(".download")
+        self._download_with_retry_to_file(
+            primary_url, max_retries, download_path, max_size=MAX_METADATA_SIZE
+        )
+        try:
+            cache_path = self._cache_primary_download(download_path, primary_location, repo_url)
+        finally:
+            download_path.unlink(missing_ok=True)
+
+        self._write_cache_stamp(repo_url, cache_path, repomd_digest)
+        return cache_path
+
+    def _find_cached_primary(
+        self, repo_url: str, primary_location: str, repomd_digest: str
+    ) -> Optional[Path]:
+        """
+        Find cached primary metadata that was downloaded for the same repomd.xml.
+
+        Args:
+            repo_url: Base URL of the RPM repository
+            primary_location: Location from repomd.xml (its extension selects the cache file)
+            repomd_digest: Digest of the current repomd.xml
+
+        Returns:
+            Path to the cached primary metadata, or None if it must be downloaded
+        """
+        suffix = ".xml.gz" if primary_location.endswith(".gz") else ".xml"
+        cache_path = self._metadata_cache_path(repo_url, suffix=suffix)
+        stamp_path = self._metadata_cache_path(repo_url, suffix=".stamp")
+        try:
+            if stamp_path.read_text(encoding="utf-8") == self._cache_stamp(
+                cache_path, repomd_digest
+            ):
+                return cache_path
+        except OSError:
+            pass  # No stamp or no cache file yet
+        return None
+
+    def _write_cache_stamp(self, repo_url: str, cache_path: Path, repomd_digest: str) -> None:
+        """
+        Record which repomd.xml the cached primary metadata was downloaded for.
+
+        Failing to write the stamp only means the next run downloads again.
+
+        Args:
+            repo_url: Base URL of the RPM repository
+            cache_path: Cached primary metadata file
+            repomd_digest: Digest of the repomd.xml it was downloaded for
+        """
+        stamp_path = self._metadata_cache_path(repo_url, suffix=".stamp")
+        try:
+            stamp_path.write_text(self._cache_stamp(cache_path, repomd_digest), encoding="utf-8")
+        except OSError as e:
+            logger.warning("Could not write cache stamp %s: %s", stamp_path, e)
+
+    @staticmethod
+    def _cache_stamp(cache_path: Path, repomd_digest: str) -> str:
+        """
+        Build the stamp identifying a cache file and the repomd.xml it came from.
+
+        The file's modification time and size are included so that a cache
+        file rewritten since (e.g. by --extract-deps) no longer matches.
+
+        Args:
+            cache_path: Cached primary metadata file
+            repomd_digest: Digest of the repomd.xml it was downloaded for
+
+        Returns:
+            Stamp text
+
+        Raises:
+            OSError: If the cache file does not exist
+        """
+        stat = cache_path.stat()
+        return f"{repomd_digest} {cache_path.name} {stat.st_mtime_ns} {stat.st_size}"
+
+    def _cache_primary_download(
+        self, download_path: Path, primary_location: str, repo_url: str
+    ) -> Path:
+        """
+        Decompress a downloaded primary metadata file into the cache.
+
+        Args:
+            download_path: Local copy of the downloaded primary metadata
+            primary_location: Location from repomd.xml (its extension selects the codec)
+            repo_url: Base URL of the RPM repository
+
+        Returns:
+            Path to the cached primary.xml file
+
+        Raises:
+            RepositoryDownloadError: If decompression or caching fails
+        """
+        if primary_location.endswith('.gz'):
+            # gzip metadata is cached as downloaded and decompressed while parsing
+            return self._cache_gzip_download(download_path, repo_url)
 
-        # Decompress based on file extension
         if primary_location.endswith('.zst'):
             try:
                 import zstandard as zstd
-                dctx = zstd.ZstdDecompressor()
-                primary_xml_data = dctx.decompress(primary_compressed_data, max_output_size=500*1024*1024)  # 500MB max
             except ImportError:
                 raise RepositoryDownloadError(
                     "Zstandard compression detected but 'zstandard' library not installed. "
                     "Install it with: pip install zstandard"
                 )
-        elif primary_location.endswith('.gz'):
-            primary_xml_data = gzip.decompress(primary_compressed_data)
-        else:
-            # Assume uncompressed
-            primary_xml_data = primary_compressed_data
-        
-        cache_path = self._cache_metadata(primary_xml_data, repo_url)
+
+        # Decompress based on file extension, streaming straight into the cache
+        # so the decompressed XML is never held in memory as a whole
+        with open(download_path, "rb") as primary_stream:
+            if primary_location.endswith('.zst'):
+                primary_xml_stream = zstd.ZstdDecompressor().stream_reader(primary_stream)
+            else:
+                # Assume uncompressed
+                primary_xml_stream = primary_stream
+
+            with primary_xml_stream:
+                cache_path = self._cache_metadata_stream(primary_xml_stream, repo_url)
+
+        logger.info(f"Repository metadata cached at {cache_path}")
+        return cache_path
+
+    def _cache_gzip_download(self, download_path: Path, repo_url: str) -> Path:
+        """
+        Keep downloaded gzip-compressed primary metadata in the cache as is.
+
+        The XML is typically 5-10x larger than the archive, and
+        get_package_list() decompresses it on the fly while parsing.
+
+        Args:
+            download_path: Local copy of the downloaded primary.xml.gz
+            repo_url: Base URL of the RPM repository
+
+        Returns:
+            Path to the cached primary.xml.gz file
+
+        Raises:
+            RepositoryDownloadError: If the file is not gzip data or is too large
+        """
+        with open(download_path, "rb") as f:
+            if f.read(2) != GZIP_MAGIC:
+                raise RepositoryDownloadError("Failed to cache metadata: not a gzip file")
+        if download_path.stat().st_size > MAX_METADATA_SIZE:
+            raise RepositoryDownloadError("Metadata file too large (>500MB)")
+
+        cache_path = self._metadata_cache_path(repo_url, suffix=".xml.gz")
+        os.replace(download_path, cache_path)
 
         logger.info(f"Repository metadata cached at {cache_path}")
         return cache_path
@@ -220,8 +521,8 @@ class RepositoryDownloader:
         
         # For now, create synthetic metadata without downloading
         # This can be enhanced later with a command-line flag
-        metadata_xml = self._create_synthetic_metadata(rpm_files, repo_url)
-        cache_path = self._cache_metadata(metadata_xml.encode('utf-8'), repo_url)
+        metadata_lines = self._create_synthetic_metadata(rpm_files, repo_url)
+        cache_path = self._cache_metadata_lines(metadata_lines, repo_url)
         
         logger.info(f"Synthetic metadata cached at {cache_path}")
         logger.info("Note: To extract dependencies, use --extract-deps flag (feature coming soon)")
@@ -244,8 +545,6 @@ class RepositoryDownloader:
         Raises:
             RepositoryDownloadError: If download fails
         """
-        from src.parser import RPMParser
-        
         # Ensure URL ends with /
         if not repo_url.endswith("/"):
             repo_url += "/"
@@ -258,33 +557,56 @@ class RepositoryDownloader:
         logger.info(f"Downloading and parsing {len(rpm_files)} RPM files...")
         logger.info("This may take a while depending on file sizes and network speed")
         
-        parser = RPMParser()
         rpm_cache_dir = self.cache_dir / "rpms"
         rpm_cache_dir.mkdir(exist_ok=True)
         
-        packages_data = []
-        processed = 0
+        downloaded = []
+        download_failures = []
         failed = 0
         
-        for idx, rpm_file in enumerate(rpm_files, 1):
+        # Downloads are network-bound, so they run in a thread pool sharing
+        # the session's connection pool; results come back in input order
+        def download(item):
+            idx, rpm_file = item
             try:
-                # Download RPM file
-                rpm_url = urljoin(repo_url, rpm_file)
-                rpm_local_path = rpm_cache_dir / rpm_file
-                
-                # Skip if already cached
-                if not rpm_local_path.exists():
-                    logger.info(f"[{idx}/{len(rpm_files)}] Downloading {rpm_file}...")
-                    rpm_data = self._download_with_retry(rpm_url, max_retries)
-                    
-                    with open(rpm_local_path, 'wb') as f:
-                        f.write(rpm_data)
-                else:
-                    logger.info(f"[{idx}/{len(rpm_files)}] Using cached {rpm_file}")
+                return self._download_rpm(
+                    repo_url, rpm_file, rpm_cache_dir, max_retries, f"[{idx}/{len(rpm_files)}]"
+                )
+            except Exception as e:
+                return e
+        
+        def downloaded_paths():
+            total = len(rpm_files)
+            for idx, (rpm_file, result) in enumerate(zip(rpm_files, download_results), 1):
+                # Progress indicator, counted against input files so failed
+                # downloads still advance it to the total
+                if idx % 100 == 0 or idx == total:
+                    logger.info(f"Progress: {idx}/{total} ({(idx/total*100):.1f}%)")
+                if isinstance(result, Exception):
+                    download_failures.append(rpm_file)
+                    logger.warning(f"Failed to download {rpm_file}: {result}")
+                    continue
+                downloaded.append(rpm_file)
+                yield result
+        
+        packages_data = []
+        processed = 0
+        
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            download_results = executor.map(download, enumerate(rpm_files, 1))
+            
+            # Parse RPMs to extract metadata and dependencies. Files are handed
+            # to the parser as soon as they are downloaded, so parsing overlaps
+            # the remaining downloads instead of waiting for all of them.
+            results = self._parse_rpm_files(downloaded_paths(), count=len(rpm_files))
+            for idx, result in enumerate(results, 1):
+                rpm_file = downloaded[idx - 1]
+                if isinstance(result, Exception):
+                    failed += 1
+                    logger.warning(f"Failed to process {rpm_file}: {result}")
+                    continue
                 
-                # Parse RPM to extract metadata and dependencies
-                metadata = parser.parse_rpm_header(rpm_local_path)
-                dependencies = parser.extract_dependencies(rpm_local_path)
+                metadata, dependencies = result
                 
                 # Fix: Source RPM files should have arch='src'
                 # The parser may extract the target arch, but we need to check the filename
@@ -305,95 +627,139 @@ class RepositoryDownloader:
                 })
                 
                 processed += 1
-                
-                # Progress indicator
-                if idx % 100 == 0 or idx == len(rpm_files):
-                    logger.info(f"Progress: {idx}/{len(rpm_files)} ({(idx/len(rpm_files)*100):.1f}%)")
-                
-            except Exception as e:
-                failed += 1
-                logger.warning(f"Failed to process {rpm_file}: {e}")
-                continue
         
+        failed += len(download_failures)
         logger.info(f"Successfully processed {processed} packages, {failed} failed")
         
         # Create metadata XML with dependencies
-        metadata_xml = self._create_metadata_with_deps(packages_data)
-        cache_path = self._cache_metadata(metadata_xml.encode('utf-8'), repo_url)
+        metadata_lines = self._create_metadata_with_deps(packages_data)
+        cache_path = self._cache_metadata_lines(metadata_lines, repo_url)
         
         logger.info(f"Metadata with dependencies cached at {cache_path}")
         return cache_path
     
-    def _create_metadata_with_deps(self, packages_data: List[Dict]) -> str:
+    def _download_rpm(
+        self, repo_url: str, rpm_file: str, rpm_cache_dir: Path, max_retries: int, position: str
+    ) -> Path:
+        """
+        Download a single RPM file into the cache unless it is already there.
+
+        Args:
+            repo_url: Base URL of the RPM repository (ending with /)
+            rpm_file: RPM filename relative to the repository URL
+            rpm_cache_dir: Directory holding downloaded RPM files
+            max_retries: Maximum number of retry attempts
+            position: Progress prefix for log messages, e.g. "[3/10]"
+
+        Returns:
+            Path to the local RPM file
+
+        Raises:
+            RepositoryDownloadError: If the download fails
+        """
+        rpm_url = urljoin(repo_url, rpm_file)
+        rpm_local_path = rpm_cache_dir / rpm_file
+        
+        # Skip if already cached
+        if rpm_local_path.exists():
+            logger.info(f"{position} Using cached {rpm_file}")
+            return rpm_local_path
+        
+        logger.info(f"{position} Downloading {rpm_file}...")
+        # Download under a temporary name so an interrupted transfer is never
+        # mistaken for a cached file
+        part_path = rpm_local_path.with_name(rpm_local_path.name + ".part")
+        self._download_with_retry_to_file(rpm_url, max_retries, part_path)
+        os.replace(part_path, rpm_local_path)
+        
+        return rpm_local_path
+    
+    def _parse_rpm_files(self, rpm_paths: Iterable[Path], count: Optional[int] = None) -> Iterator:
+        """
+        Parse RPM files, using a process pool for large batches.
+
+        Every file is independent, so once there are enough of them to pay
+        for worker start-up they are spread across all CPU cores. rpm_paths
+        is consumed lazily, so it may be a generator still producing files.
+
+        Args:
+            rpm_paths: Paths of the RPM files to parse
+            count: Number of paths expected (defaults to len(rpm_paths))
+
+        Returns:
+            Iterator yielding, in input order, a (PackageMetadata, dependencies)
+            tuple for each file, or the exception raised while parsing it
+        """
+        if count is None:
+            count = len(rpm_paths)
+        
+        if count < PARALLEL_PARSE_THRESHOLD or (os.cpu_count() or 1) < 2:
+            _init_rpm_worker()
+            return map(_parse_rpm_worker, rpm_paths)
+        
+        return self._parse_rpm_files_pooled(rpm_paths)
+    
+    def _parse_rpm_files_pooled(self, rpm_paths: Iterable[Path]) -> Iterator:
+        """
+        Parse RPM files in a process pool, yielding results in input order.
+
+        Args:
+            rpm_paths: Paths of the RPM files to parse
+
+        Yields:
+            (PackageMetadata, dependencies) tuple or exception per file
+        """
+        # Download threads may be running, and forking a threaded process can
+        # deadlock the children, so workers come from a fork server when possible
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        
+        try:
+            pool = context.Pool(initializer=_init_rpm_worker)
+        except OSError as e:
+            logger.warning(f"Parallel RPM parsing unavailable ({e}), parsing serially")
+            _init_rpm_worker()
+            yield from map(_parse_rpm_worker, rpm_paths)
+            return
+        
+        with pool:
+            yield from pool.imap(_parse_rpm_worker, rpm_paths, chunksize=4)
+    
+    def _create_metadata_with_deps(self, packages_data: List[Dict]) -> Iterator[str]:
         """
         Create primary.xml metadata with full dependency information.
 
         Args:
             packages_data: List of dictionaries containing metadata and dependencies
 
-        Returns:
-            XML string in primary.xml format
+        Yields:
+            Pieces of the primary.xml document, to be joined with newlines
         """
-        xml_parts = ['<?xml version="1.0" encoding="UTF-8"?>']
-        xml_parts.append('<metadata xmlns="http://linux.duke.edu/metadata/common" xmlns:rpm="http://linux.duke.edu/metadata/rpm" packages="{}">'.format(len(packages_data)))
+        yield '<?xml version="1.0" encoding="UTF-8"?>'
+        yield '<metadata xmlns="http://linux.duke.edu/metadata/common" xmlns:rpm="http://linux.duke.edu/metadata/rpm" packages="{}">'.format(len(packages_data))
         
         for pkg_data in packages_data:
             metadata = pkg_data['metadata']
             dependencies = pkg_data['dependencies']
             location = pkg_data['location']
             
-            xml_parts.append('  <package type="rpm">')
-            xml_parts.append(f'    <name>{self._escape_xml(metadata.name)}</name>')
-            xml_parts.append(f'    <arch>{self._escape_xml(metadata.arch)}</arch>')
-            xml_parts.append(f'    <version epoch="0" ver="{self._escape_xml(metadata.version)}" rel="{self._escape_xml(metadata.release)}"/>')
-            xml_parts.append(f'    <checksum type="sha256"></checksum>')
-            xml_parts.append('    <summary></summary>')
-            xml_parts.append('    <description></description>')
-            xml_parts.append('    <packager></packager>')
-            xml_parts.append('    <url></url>')
-            xml_parts.append('    <time file="0" build="0"/>')
-            xml_parts.append('    <size package="0" installed="0" archive="0"/>')
-            xml_parts.append(f'    <location href="{self._escape_xml(location)}"/>')
-            xml_parts.append('    <format>')
-            xml_parts.append('      <rpm:license></rpm:license>')
-            xml_parts.append('      <rpm:vendor></rpm:vendor>')
-            xml_parts.append('      <rpm:group></rpm:group>')
-            xml_parts.append('      <rpm:buildhost></rpm:buildhost>')
-            xml_parts.append('      <rpm:sourcerpm></rpm:sourcerpm>')
-            
-            # Add provides
             provides = [d for d in dependencies if d.type == 'provides']
-            if provides:
-                xml_parts.append('      <rpm:provides>')
-                for dep in provides:
-                    if dep.version:
-                        xml_parts.append(f'        <rpm:entry name="{self._escape_xml(dep.name)}" ver="{self._escape_xml(dep.version)}"/>')
-                    else:
-                        xml_parts.append(f'        <rpm:entry name="{self._escape_xml(dep.name)}"/>')
-                xml_parts.append('      </rpm:provides>')
-            else:
-                xml_parts.append('      <rpm:provides/>')
-            
-            # Add requires/buildrequires
             requires = [d for d in dependencies if d.type in ('requires', 'buildrequires')]
-            if requires:
-                xml_parts.append('      <rpm:requires>')
-                for dep in requires:
-                    if dep.version:
-                        xml_parts.append(f'        <rpm:entry name="{self._escape_xml(dep.name)}" ver="{self._escape_xml(dep.version)}"/>')
-                    else:
-                        xml_parts.append(f'        <rpm:entry name="{self._escape_xml(dep.name)}"/>')
-                xml_parts.append('      </rpm:requires>')
-            else:
-                xml_parts.append('      <rpm:requires/>')
             
-            xml_parts.append('    </format>')
-            xml_parts.append('  </package>')
+            # One template substitution per package instead of a string per line
+            yield PACKAGE_TEMPLATE.format_map({
+                'name': self._escape_xml(metadata.name),
+                'arch': self._escape_xml(metadata.arch),
+                'version': self._escape_xml(metadata.version),
+                'release': self._escape_xml(metadata.release),
+                'location': self._escape_xml(location),
+                'provides': self._format_dependency_list('provides', provides),
+                'requires': self._format_dependency_list('requires', requires),
+            })
         
-        xml_parts.append('</metadata>')
-        return '\n'.join(xml_parts)
+        yield '</metadata>'
 
-    def _create_synthetic_metadata(self, rpm_files: List[str], repo_url: str) -> str:
+    def _create_synthetic_metadata(self, rpm_files: List[str], repo_url: str) -> Iterator[str]:
         """
         Create synthetic primary.xml metadata from RPM file list.
 
@@ -401,66 +767,90 @@ class RepositoryDownloader:
             rpm_files: List of RPM filenames
             repo_url: Base repository URL
 
-        Returns:
-            XML string in primary.xml format
+        Yields:
+            Pieces of the primary.xml document, to be joined with newlines
         """
-        xml_parts = ['<?xml version="1.0" encoding="UTF-8"?>']
-        xml_parts.append('<metadata xmlns="http://linux.duke.edu/metadata/common" xmlns:rpm="http://linux.duke.edu/metadata/rpm" packages="{}">'.format(len(rpm_files)))
+        yield '<?xml version="1.0" encoding="UTF-8"?>'
+        yield '<metadata xmlns="http://linux.duke.edu/metadata/common" xmlns:rpm="http://linux.duke.edu/metadata/rpm" packages="{}">'.format(len(rpm_files))
         
         for rpm_file in rpm_files:
-            # Parse RPM filename: name-version-release.arch.rpm
-            # Example: bash-4.2.46-35.el7.x86_64.rpm
-            match = re.match(r'^(.+)-([^-]+)-([^-]+)\.([^.]+)\.rpm$', rpm_file)
+            parts = self._split_rpm_filename(rpm_file)
             
-            if not match:
+            if parts is None:
                 logger.warning(f"Could not parse RPM filename: {rpm_file}")
                 continue
             
-            name, version, release, arch = match.groups()
-            
-            # Handle .src.rpm files
-            if rpm_file.endswith('.src.rpm'):
-                arch = 'src'
-                # Re-parse for source RPMs
-                match = re.match(r'^(.+)-([^-]+)-([^-]+)\.src\.rpm$', rpm_file)
-                if match:
-                    name, version, release = match.groups()
+            name, version, release, arch = parts
             
             is_source = arch in ('src', 'nosrc')
             
-            xml_parts.append('  <package type="rpm">')
-            xml_parts.append(f'    <name>{self._escape_xml(name)}</name>')
-            xml_parts.append(f'    <arch>{self._escape_xml(arch)}</arch>')
-            xml_parts.append(f'    <version epoch="0" ver="{self._escape_xml(version)}" rel="{self._escape_xml(release)}"/>')
-            xml_parts.append(f'    <checksum type="sha256"></checksum>')
-            xml_parts.append('    <summary></summary>')
-            xml_parts.append('    <description></description>')
-            xml_parts.append('    <packager></packager>')
-            xml_parts.append('    <url></url>')
-            xml_parts.append('    <time file="0" build="0"/>')
-            xml_parts.append('    <size package="0" installed="0" archive="0"/>')
-            xml_parts.append(f'    <location href="{self._escape_xml(rpm_file)}"/>')
-            xml_parts.append('    <format>')
-            xml_parts.append('      <rpm:license></rpm:license>')
-            xml_parts.append('      <rpm:vendor></rpm:vendor>')
-            xml_parts.append('      <rpm:group></rpm:group>')
-            xml_parts.append('      <rpm:buildhost></rpm:buildhost>')
-            xml_parts.append('      <rpm:sourcerpm></rpm:sourcerpm>')
-            xml_parts.append('      <rpm:provides/>')
-            xml_parts.append('      <rpm:requires/>')
-            xml_parts.append('    </format>')
-            xml_parts.append('  </package>')
-        
-        xml_parts.append('</metadata>')
-        return '\n'.join(xml_parts)
-
-    def _escape_xml(self, text: str) -> str:
-        """Escape special XML characters"""
-        return (text.replace('&', '&amp;')
-                   .replace('<', '&lt;')
-                   .replace('>', '&gt;')
-                   .replace('"', '&quot;')
-                   .replace("'", '&apos;'))
+            yield PACKAGE_TEMPLATE.format_map({
+                'name': self._escape_xml(name),
+                'arch': self._escape_xml(arch),
+                'version': self._escape_xml(version),
+                'release': self._escape_xml(release),
+                'location': self._escape_xml(rpm_file),
+                'provides': '      <rpm:provides/>',
+                'requires': '      <rpm:requires/>',
+            })
+        
+        yield '</metadata>'
+
+    def _format_dependency_list(self, tag: str, dependencies: List) -> str:
+        """
+        Render an rpm:provides or rpm:requires element for generated primary.xml.
+
+        Args:
+            tag: "provides" or "requires"
+            dependencies: Dependency objects to list
+
+        Returns:
+            Indented XML element, self-closing when there are no dependencies
+        """
+        if not dependencies:
+            return f'      <rpm:{tag}/>'
+        
+        lines = [f'      <rpm:{tag}>']
+        for dep in dependencies:
+            if dep.version:
+                lines.append(f'        <rpm:entry name="{self._escape_xml(dep.name)}" ver="{self._escape_xml(dep.version)}"/>')
+            else:
+                lines.append(f'        <rpm:entry name="{self._escape_xml(dep.name)}"/>')
+        lines.append(f'      </rpm:{tag}>')
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _split_rpm_filename(rpm_file: str) -> Optional[Tuple[str, str, str, str]]:
+        """
+        Split an RPM filename of the form name-version-release.arch.rpm.
+
+        Example: bash-4.2.46-35.el7.x86_64.rpm -> bash, 4.2.46, 35.el7, x86_64
+        (source packages simply have arch "src").
+
+        Args:
+            rpm_file: RPM filename
+
+        Returns:
+            (name, version, release, arch) tuple, or None if the name does not match
+        """
+        # Splitting from the right parses the fixed suffix structure in linear
+        # time, without the backtracking a regex with a leading (.+) does
+        if not rpm_file.endswith(".rpm"):
+            return None
+        base, _, arch = rpm_file[:-4].rpartition(".")
+        if not base or not arch:
+            return None
+        parts = base.rsplit("-", 2)
+        if len(parts) != 3 or not all(parts):
+            return None
+        name, version, release = parts
+        return name, version, release, arch
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _escape_xml(text: str) -> str:
+        """Escape special XML characters (cached: arch, version and dependency names repeat)"""
+        return text.translate(_XML_ESCAPE)
 
     def _download_with_retry(self, url: str, max_retries: int) -> bytes:
         """
@@ -473,6 +863,87 @@ class RepositoryDownloader:
         Returns:
             Downloaded data as bytes
 
+        Raises:
+            RepositoryDownloadError: If all retry attempts fail
+        """
+        def fetch() -> bytes:
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            return response.content
+
+        return self._with_retry(url, max_retries, fetch)
+
+    def _download_with_retry_to_file(
+        self, url: str, max_retries: int, dest_path: Path, max_size: Optional[int] = None
+    ) -> Path:
+        """
+        Download URL to a file in chunks, with exponential backoff retry logic.
+
+        Only one chunk of the response is held in memory at a time.
+
+        Args:
+            url: URL to download from
+            max_retries: Maximum number of retry attempts
+            dest_path: File to write the response body to (overwritten)
+            max_size: Largest accepted body in bytes (None for no limit). Checked
+                against Content-Length before reading and again while streaming
+
+        Returns:
+            dest_path
+
+        Raises:
+            RepositoryDownloadError: If all retry attempts fail, the body exceeds
+                max_size or the file cannot be written
+        """
+        def too_large() -> RepositoryDownloadError:
+            return RepositoryDownloadError(
+                f"Download of {url} exceeds the size limit ({max_size} bytes)"
+            )
+
+        def fetch() -> Path:
+            response = self.session.get(url, timeout=30, stream=True)
+            try:
+                response.raise_for_status()
+                if max_size is not None:
+                    try:
+                        content_length = int(response.headers.get("Content-Length"))
+                    except (TypeError, ValueError):
+                        content_length = None  # Missing or malformed: checked while streaming
+                    if content_length is not None and content_length > max_size:
+                        raise too_large()
+
+                size = 0
+                with open(dest_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=READ_BUFFER_SIZE):
+                        size += len(chunk)
+                        if max_size is not None and size > max_size:
+                            raise too_large()
+                        f.write(chunk)
+            finally:
+                response.close()
+            return dest_path
+
+        try:
+            return self._with_retry(url, max_retries, fetch)
+        except OSError as e:
+            dest_path.unlink(missing_ok=True)
+            raise RepositoryDownloadError(f"Failed to write {dest_path.name}: {e}")
+        except RepositoryDownloadError:
+            dest_path.unlink(missing_ok=True)
+            raise
+
+    def _with_retry(self, url: str, max_retries: int, fetch: Callable[[], T]) -> T:
+        """
+        Call fetch() until it succeeds, backing off exponentially on network errors.
+
+        Args:
+            url: URL being fetched (for error messages)
+            max_retries: Maximum number of attempts
+            fetch: Function performing one download attempt
+
+        Returns:
+            Result of the first successful fetch() call
+
         Raises:
             RepositoryDownloadError: If all retry attempts fail
         """
@@ -480,9 +951,7 @@ class RepositoryDownloader:
 
         for attempt in range(max_retries):
             try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                return response.content
+                return fetch()
             except requests.RequestException as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -545,24 +1014,102 @@ class RepositoryDownloader:
         except ET.ParseError as e:
             raise RepositoryDownloadError(f"Failed to parse repomd.xml: {e}")
 
-    def _cache_metadata(self, data: bytes, repo_url: str) -> Path:
+    def _cache_metadata_lines(self, lines: Iterable[str], repo_url: str) -> Path:
         """
-        Cache metadata to local filesystem.
+        Stream generated metadata lines to the local cache.
+
+        Lines are encoded and written one at a time, so the document is never
+        held in memory as a whole.
 
         Args:
-            data: Metadata content to cache
+            lines: Lines (or multi-line pieces) of the metadata document, without
+                trailing line terminators; they are joined with newlines
             repo_url: Repository URL (used to generate cache filename)
 
         Returns:
             Path to cached file
+
+        Raises:
+            RepositoryDownloadError: If the metadata is too large or cannot be written
         """
-        # Validate data size (limit to 500MB for large repositories)
-        if len(data) > 500 * 1024 * 1024:
-            raise RepositoryDownloadError("Metadata file too large (>500MB)")
+        def chunks():
+            separator = b""
+            for line in lines:
+                yield separator + line.encode("utf-8")
+                separator = b"\n"
+
+        return self._write_metadata_chunks(chunks(), repo_url)
+
+    def _cache_metadata_stream(self, stream: BinaryIO, repo_url: str) -> Path:
+        """
+        Copy metadata from a binary stream (e.g. a decompressor) to the local cache.
+
+        Args:
+            stream: Readable binary file object
+            repo_url: Repository URL (used to generate cache filename)
+
+        Returns:
+            Path to cached file
+
+        Raises:
+            RepositoryDownloadError: If the metadata is too large, cannot be
+                read (e.g. corrupt compressed data) or cannot be written
+        """
+        return self._write_metadata_chunks(
+            iter(lambda: stream.read(READ_BUFFER_SIZE), b""), repo_url
+        )
+
+    def _write_metadata_chunks(self, chunks: Iterable[bytes], repo_url: str) -> Path:
+        """
+        Write metadata chunks to the cache file, enforcing the size limit.
 
-        # Generate cache filename from repo URL hash
-        url_hash = hashlib.md5(repo_url.encode()).hexdigest()
-        cache_path = self.cache_dir / f"primary_{url_hash}.xml"
+        A partially written file is removed if anything goes wrong.
+
+        Args:
+            chunks: Consecutive pieces of the metadata document
+            repo_url: Repository URL (used to generate cache filename)
+
+        Returns:
+            Path to cached file
+
+        Raises:
+            RepositoryDownloadError: If the metadata is too large or cannot be written
+        """
+        cache_path = self._metadata_cache_path(repo_url)
+
+        size = 0
+        try:
+            with open(cache_path, "wb", buffering=METADATA_WRITE_BUFFER) as f:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if size > MAX_METADATA_SIZE:
+                        raise RepositoryDownloadError("Metadata file too large (>500MB)")
+                    f.write(chunk)
+        except Exception as e:
+            cache_path.unlink(missing_ok=True)
+            if isinstance(e, RepositoryDownloadError):
+                raise
+            raise RepositoryDownloadError(f"Failed to cache metadata: {e}") from e
+
+        return cache_path
+
+    def _metadata_cache_path(self, repo_url: str, suffix: str = ".xml") -> Path:
+        """
+        Return the cache file path for a repository's metadata.
+
+        Args:
+            repo_url: Repository URL (used to generate cache filename)
+            suffix: File name suffix (".xml", or ".xml.gz" for compressed metadata)
+
+        Returns:
+            Path inside the cache directory
+
+        Raises:
+            RepositoryDownloadError: If the path escapes the cache directory
+        """
+        # Generate cache filename from repo URL hash (a file name, not a security boundary)
+        url_hash = hashlib.blake2b(repo_url.encode(), digest_size=8).hexdigest()
+        cache_path = self.cache_dir / f"primary_{url_hash}{suffix}"
 
         # Validate cache path is within cache directory
         try:
@@ -570,13 +1117,6 @@ class RepositoryDownloader:
         except ValidationError as e:
             raise RepositoryDownloadError(f"Invalid cache path: {e}")
 
-        # Use context manager for safe file operations
-        try:
-            with open(cache_path, "wb") as f:
-                f.write(data)
-        except (OSError, IOError) as e:
-            raise RepositoryDownloadError(f"Failed to write cache file: {e}")
-
         return cache_path
 
     def get_package_list(self, primary_xml_path: Path) -> List[PackageInfo]:
@@ -584,7 +1124,7 @@ class RepositoryDownloader:
         Parse primary.xml to extract package information.
 
         Args:
-            primary_xml_path: Path to primary.xml file
+            primary_xml_path: Path to primary.xml file (gzip-compressed if it ends in .gz)
 
         Returns:
             List of PackageInfo objects
@@ -603,28 +1143,28 @@ class RepositoryDownloader:
             raise RepositoryDownloadError(f"Invalid primary.xml file: {e}")
 
         try:
-            tree = ET.parse(primary_xml_path)
-            root = tree.getroot()
-
-            # Handle XML namespace
-            namespace = {"common": "http://linux.duke.edu/metadata/common"}
-
             packages = []
-            package_elements = root.findall(".//common:package", namespace)
-
-            # Try without namespace if no packages found
-            if not package_elements:
-                package_elements = root.findall(".//package")
-
-            total_elements = len(package_elements)
-            logger.info(f"Found {total_elements} package entries to parse")
-
+            total_elements = None
             error_count = 0
-            progress_interval = max(1, total_elements // 10)
 
-            for idx, pkg_elem in enumerate(package_elements, 1):
+            idx = 0
+            for root, pkg_elem in self._iter_package_elements(primary_xml_path):
+                if total_elements is None:
+                    # Handle XML namespace: the first package tells whether the
+                    # document uses the common namespace
+                    namespaced = pkg_elem.tag == _NAMESPACED_TAGS.package
+                    tags = _NAMESPACED_TAGS if namespaced else _PLAIN_TAGS
+
+                    # The package count is only known up front if the root declares it
+                    declared_count = root.get("packages", "")
+                    total_elements = int(declared_count) if declared_count.isdigit() else 0
+                    if total_elements:
+                        logger.info(f"Found {total_elements} package entries to parse")
+                    progress_interval = max(1, total_elements // 10) if total_elements else 1000
+
+                idx += 1
                 try:
-                    package_info = self._extract_package_info(pkg_elem, namespace)
+                    package_info = self._extract_package_info(pkg_elem, tags)
                     if package_info:
                         packages.append(package_info)
                     else:
@@ -632,22 +1172,24 @@ class RepositoryDownloader:
 
                     # Progress indicator
                     if idx % progress_interval == 0 or idx == total_elements:
-                        progress_pct = (idx / total_elements) * 100
-                        logger.debug(
-                            f"Parsing progress: {idx}/{total_elements} ({progress_pct:.1f}%)"
-                        )
+                        if total_elements:
+                            progress_pct = (idx / total_elements) * 100
+                            logger.debug(
+                                "Parsing progress: %d/%d (%.1f%%)", idx, total_elements, progress_pct
+                            )
+                        else:
+                            logger.debug("Parsing progress: %d packages", idx)
 
                 except Exception as e:
                     error_count += 1
                     # Log error but continue processing other packages
                     pkg_name = pkg_elem.find(".//name")
                     pkg_name_text = pkg_name.text if pkg_name is not None else "unknown"
-                    logger.warning(f"Failed to parse package {pkg_name_text}: {e}")
+                    logger.warning("Failed to parse package %s: %s", pkg_name_text, e)
                     logger.debug("Package parsing error details:", exc_info=True)
-                    continue
 
             if error_count > 0:
-                logger.warning(f"Encountered {error_count} errors while parsing packages")
+                logger.warning("Encountered %d errors while parsing packages", error_count)
 
             if not packages:
                 raise RepositoryDownloadError("No valid packages found in repository metadata")
@@ -655,7 +1197,7 @@ class RepositoryDownloader:
             logger.info(f"Successfully parsed {len(packages)} packages")
             return packages
 
-        except ET.ParseError as e:
+        except XML_PARSE_ERRORS as e:
             logger.error(f"XML parsing error: {e}")
             raise RepositoryDownloadError(f"Failed to parse primary.xml: {e}")
         except RepositoryDownloadError:
@@ -664,36 +1206,146 @@ class RepositoryDownloader:
             logger.error(f"Unexpected error reading primary.xml: {e}", exc_info=True)
             raise RepositoryDownloadError(f"Error reading primary.xml: {e}")
 
-    def _extract_package_info(self, pkg_elem: ET.Element, namespace: dict) -> Optional[PackageInfo]:
+    def _iter_package_elements(self, primary_xml_path: Path) -> Iterator:
+        """
+        Parse primary.xml incrementally, yielding one <package> element at a time.
+
+        Each package subtree is dropped once the caller moves on to the next
+        one, so memory stays proportional to one package, not the repository.
+        lxml is used when installed: it filters package tags in C and parses
+        several times faster than xml.etree.ElementTree.
+
+        Args:
+            primary_xml_path: Path to primary.xml file
+
+        Yields:
+            (root element, package element) tuples
+
+        Raises:
+            RepositoryDownloadError: If gzip-compressed metadata decompresses
+                to more than MAX_METADATA_SIZE bytes
+        """
+        package_tags = (_NAMESPACED_TAGS.package, _PLAIN_TAGS.package)
+
+        if str(primary_xml_path).endswith(".gz"):
+            # Only the compressed file size is checked up front, so cap the
+            # decompressed XML as it is read
+            source = io.BufferedReader(
+                _SizeLimitedReader(gzip.open(primary_xml_path, "rb"), MAX_METADATA_SIZE),
+                READ_BUFFER_SIZE,
+            )
+        else:
+            source = open(primary_xml_path, "rb")
+
+        with source:
+            if lxml_etree is not None:
+                context = lxml_etree.iterparse(
+                    source,
+                    events=("end",),
+                    tag=package_tags,
+                    resolve_entities=False,
+                    no_network=True,
+                )
+                for _, pkg_elem in context:
+                    yield pkg_elem.getroottree().getroot(), pkg_elem
+                    pkg_elem.clear()
+                    # Also drop the emptied elements of earlier packages
+                    while pkg_elem.getprevious() is not None:
+                        del pkg_elem.getparent()[0]
+                return
+
+            context = ET.iterparse(source, events=("start", "end"))
+            _, root = next(context)
+            for event, pkg_elem in context:
+                if event == "end" and pkg_elem.tag in package_tags:
+                    yield root, pkg_elem
+                    pkg_elem.clear()
+                    root.clear()
+
+    @staticmethod
+    def _is_hex_digest(value: str) -> bool:
+        """
+        Check that a checksum is a hex digest (whole bytes, no separators).
+
+        bytes.fromhex() validates in C and is about twice as fast as a regex
+        match on a 64-character digest; isalnum() rejects the whitespace it
+        would otherwise skip.
+        """
+        if not value.isalnum():
+            return False
+        try:
+            bytes.fromhex(value)
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def _extract_dependency_names(format_elem: ET.Element, list_tag: str) -> List[str]:
+        """
+        Collect entry names from a dependency list inside a <format> element.
+
+        Entries are looked up in the namespace of their list element first,
+        so a document needs a second walk of the list only if it mixes
+        namespaced and plain tags.
+
+        Args:
+            format_elem: The package's <format> element
+            list_tag: "requires" or "provides"
+
+        Returns:
+            Interned dependency names in document order
+        """
+        rpm_list, plain_list = _RPM_TAGS[list_tag]
+        rpm_entry, plain_entry = _RPM_TAGS["entry"]
+
+        list_elem = format_elem.find(rpm_list)
+        entry_tags = (rpm_entry, plain_entry)
+        if list_elem is None:
+            list_elem = format_elem.find(plain_list)
+            if list_elem is None:
+                return []
+            entry_tags = (plain_entry, rpm_entry)
+
+        names = []
+        for entry_tag in entry_tags:
+            for entry in list_elem.findall(entry_tag):
+                dep_name = entry.get("name")
+                if dep_name:
+                    # The same names recur in most packages; share one copy
+                    names.append(sys.intern(dep_name))
+            if names:
+                break
+        return names
+
+    def _extract_package_info(
+        self, pkg_elem: ET.Element, tags: _PackageTags = _NAMESPACED_TAGS
+    ) -> Optional[PackageInfo]:
         """
         Extract package information from a package XML element.
 
         Args:
             pkg_elem: XML element representing a package
-            namespace: XML namespace dictionary
+            tags: Resolved tag names for the document's namespace
 
         Returns:
             PackageInfo object or None if extraction fails
         """
         # Extract name
-        name_elem = pkg_elem.find("common:name", namespace)
-        if name_elem is None:
-            name_elem = pkg_elem.find("name")
+        name_elem = pkg_elem.find(tags.name)
         if name_elem is None or name_elem.text is None:
             return None
         name = name_elem.text
 
         # Validate package name
         try:
-            name = validate_package_name(name)
+            # Interned so graph keys share the object with dependency names
+            name = sys.intern(validate_package_name(name))
         except ValidationError as e:
-            logger.warning(f"Invalid package name: {e}")
+            logger.warning("Invalid package name: %s", e)
             return None
 
         # Extract version info
-        version_elem = pkg_elem.find("common:version", namespace)
-        if version_elem is None:
-            version_elem = pkg_elem.find("version")
+        version_elem = pkg_elem.find(tags.version)
         if version_elem is None:
             return None
 
@@ -705,26 +1357,22 @@ class RepositoryDownloader:
             version = validate_metadata_string(version, "version", max_length=128)
             release = validate_metadata_string(release, "release", max_length=128)
         except ValidationError as e:
-            logger.warning(f"Invalid version/release for package {name}: {e}")
+            logger.warning("Invalid version/release for package %s: %s", name, e)
             return None
 
         # Extract architecture
-        arch_elem = pkg_elem.find("common:arch", namespace)
-        if arch_elem is None:
-            arch_elem = pkg_elem.find("arch")
+        arch_elem = pkg_elem.find(tags.arch)
         arch = arch_elem.text if arch_elem is not None and arch_elem.text is not None else "noarch"
 
         # Validate architecture
         try:
             arch = validate_metadata_string(arch, "architecture", max_length=64)
         except ValidationError as e:
-            logger.warning(f"Invalid architecture for package {name}: {e}")
+            logger.warning("Invalid architecture for package %s: %s", name, e)
             return None
 
         # Extract location
-        location_elem = pkg_elem.find("common:location", namespace)
-        if location_elem is None:
-            location_elem = pkg_elem.find("location")
+        location_elem = pkg_elem.find(tags.location)
         if location_elem is None:
             return None
         location = location_elem.get("href", "")
@@ -734,16 +1382,14 @@ class RepositoryDownloader:
             location = validate_metadata_string(location, "location", max_length=512)
             # Ensure no absolute paths or path traversal
             if location.startswith("/") or ".." in location:
-                logger.warning(f"Suspicious location path for package {name}: {location}")
+                logger.warning("Suspicious location path for package %s: %s", name, location)
                 return None
         except ValidationError as e:
-            logger.warning(f"Invalid location for package {name}: {e}")
+            logger.warning("Invalid location for package %s: %s", name, e)
             return None
 
         # Extract checksum
-        checksum_elem = pkg_elem.find("common:checksum", namespace)
-        if checksum_elem is None:
-            checksum_elem = pkg_elem.find("checksum")
+        checksum_elem = pkg_elem.find(tags.checksum)
         checksum = (
             checksum_elem.text
             if checksum_elem is not None and checksum_elem.text is not None
@@ -754,8 +1400,8 @@ class RepositoryDownloader:
         if checksum:
             try:
                 checksum = validate_metadata_string(checksum, "checksum", max_length=128)
-                if not re.match(r"^[a-fA-F0-9]+$", checksum):
-                    logger.warning(f"Invalid checksum format for package {name}")
+                if not self._is_hex_digest(checksum):
+                    logger.warning("Invalid checksum format for package %s", name)
                     checksum = ""
             except ValidationError:
                 checksum = ""
@@ -766,51 +1412,17 @@ class RepositoryDownloader:
 
         # Determine if source package
         # Source packages typically have arch='src' or name ends with '.src'
-        is_source = arch == "src" or arch == "nosrc" or name.endswith(".src")
+        is_source = arch in ("src", "nosrc") or name.endswith(".src")
 
         # Extract dependencies from format section
         requires_list = []
         provides_list = []
         
-        format_elem = pkg_elem.find("common:format", namespace)
-        if format_elem is None:
-            format_elem = pkg_elem.find("format")
+        format_elem = pkg_elem.find(tags.format)
         
         if format_elem is not None:
-            # Extract requires
-            rpm_ns = {"rpm": "http://linux.duke.edu/metadata/rpm"}
-            requires_elem = format_elem.find("rpm:requires", rpm_ns)
-            if requires_elem is None:
-                requires_elem = format_elem.find("requires")
-            
-            if requires_elem is not None:
-                for entry in requires_elem.findall("rpm:entry", rpm_ns):
-                    dep_name = entry.get("name")
-                    if dep_name:
-                        requires_list.append(dep_name)
-                # Try without namespace
-                if not requires_list:
-                    for entry in requires_elem.findall("entry"):
-                        dep_name = entry.get("name")
-                        if dep_name:
-                            requires_list.append(dep_name)
-            
-            # Extract provides
-            provides_elem = format_elem.find("rpm:provides", rpm_ns)
-            if provides_elem is None:
-                provides_elem = format_elem.find("provides")
-            
-            if provides_elem is not None:
-                for entry in provides_elem.findall("rpm:entry", rpm_ns):
-                    prov_name = entry.get("name")
-                    if prov_name:
-                        provides_list.append(prov_name)
-                # Try without namespace
-                if not provides_list:
-                    for entry in provides_elem.findall("entry"):
-                        prov_name = entry.get("name")
-                        if prov_name:
-                            provides_list.append(prov_name)
+            requires_list = self._extract_dependency_names(format_elem, "requires")
+            provides_list = self._extract_dependency_names(format_elem, "provides")
 
         return PackageInfo(
             name=name,
@@ -5,19 +5,36 @@ This module provides a Flask-based web server with API endpoints
 for accessing dependency graph data and serving the visualization interface.
 """
 
+import functools
 import logging
 from pathlib import Path
-from typing import Dict, Optional
-from flask import Flask, render_template, jsonify, send_from_directory, request
+from typing import Dict, Optional, Tuple
+from flask import Flask, Response, render_template, jsonify, request
 from werkzeug.exceptions import HTTPException
 import json
 import re
 
+from src.graph import dumps_json, loads_json
 from src.validation import validate_file_path, validate_file_size, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Graph type names: alphanumeric characters and underscores only
+_GRAPH_TYPE_RE = re.compile(r"^[a-zA-Z0-9_]+$")
+_ALLOWED_GRAPH_TYPES = frozenset({"build", "runtime"})
 
+# Serialized graph responses keyed by file path, stored with the
+# (mtime_ns, size) of the file they were built from
+_GRAPH_CACHE: Dict[str, Tuple[int, int, bytes]] = {}
+
+# Node and edge counts keyed by file path, stored the same way
+_GRAPH_COUNTS_CACHE: Dict[str, Tuple[int, int, int, int]] = {}
+
+# Largest graph file served, also applied to the decompressed size of .zst files
+MAX_GRAPH_SIZE_MB = 500
+
+
+@functools.lru_cache(maxsize=64)
 def validate_graph_type(graph_type: str) -> bool:
     """
     Validate graph type parameter.
@@ -29,7 +46,87 @@ def validate_graph_type(graph_type: str) -> bool:
         True if valid, False otherwise
     """
     # Only allow alphanumeric characters and underscores
-    return bool(re.match(r"^[a-zA-Z0-9_]+$", graph_type)) and graph_type in ["build", "runtime"]
+    return bool(_GRAPH_TYPE_RE.match(graph_type)) and graph_type in _ALLOWED_GRAPH_TYPES
+
+
+def find_graph_file(data_dir: Path, graph_type: str) -> Path:
+    """
+    Locate the file holding a graph, plain or zstd-compressed.
+
+    Args:
+        data_dir: Directory containing graph files
+        graph_type: Type of graph ('build' or 'runtime')
+
+    Returns:
+        Path to <type>_graph.json, or to <type>_graph.json.zst if only the
+        compressed file exists
+    """
+    graph_file = data_dir / f"{graph_type}_graph.json"
+    compressed_file = data_dir / f"{graph_type}_graph.json.zst"
+    if not graph_file.exists() and compressed_file.exists():
+        return compressed_file
+    return graph_file
+
+
+def read_graph_json(graph_file: Path) -> Dict:
+    """
+    Read a graph file, decompressing it first if it is a .zst file.
+
+    Args:
+        graph_file: Path to the graph file
+
+    Returns:
+        Parsed graph data
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+        ValidationError: If a .zst file decompresses to more than MAX_GRAPH_SIZE_MB
+    """
+    if graph_file.suffix == ".zst":
+        import zstandard as zstd
+
+        max_size = MAX_GRAPH_SIZE_MB * 1024 * 1024
+        with open(graph_file, "rb") as f:
+            # Read one byte past the limit to tell a full-size file from a larger one
+            data = zstd.ZstdDecompressor().stream_reader(f).read(max_size + 1)
+        if len(data) > max_size:
+            raise ValidationError(
+                f"Decompressed size of {graph_file} exceeds "
+                f"maximum allowed size ({MAX_GRAPH_SIZE_MB} MB)"
+            )
+        return loads_json(data)
+
+    return loads_json(graph_file.read_bytes())
+
+
+def read_graph_counts(graph_file: Path) -> Tuple[int, int]:
+    """
+    Get the node and edge counts of a graph file.
+
+    Counts are cached against the file's modification time and size, so
+    the file is only parsed again after it changes.
+
+    Args:
+        graph_file: Path to the graph file
+
+    Returns:
+        (node count, edge count) tuple
+
+    Raises:
+        OSError: If the file cannot be read
+        json.JSONDecodeError: If the file is not valid JSON
+        ValidationError: If a .zst file decompresses to more than MAX_GRAPH_SIZE_MB
+    """
+    stat = graph_file.stat()
+    cache_key = str(graph_file)
+    cached = _GRAPH_COUNTS_CACHE.get(cache_key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2], cached[3]
+
+    graph_data = read_graph_json(graph_file)
+    counts = len(graph_data.get("nodes", [])), len(graph_data.get("edges", []))
+    _GRAPH_COUNTS_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size) + counts
+    return counts
 
 
 def create_app(
@@ -89,35 +186,6 @@ def index():
     return render_template("index.html")
 
 
-@app.route("/static/<path:filename>")
-def serve_static(filename):
-    """
-    Serve static files (CSS, JavaScript).
-
-    Args:
-        filename: Path to static file
-
-    Returns:
-        Static file content
-    """
-    # Validate filename to prevent directory traversal
-    try:
-        # Ensure filename doesn't contain path traversal attempts
-        if ".." in filename or filename.startswith("/") or "\\" in filename:
-            logger.warning(f"Suspicious static file request: {filename}")
-            return jsonify({"error": "Invalid file path"}), 400
-
-        # Validate the full path is within static folder
-        full_path = Path(app.static_folder) / filename
-        validate_file_path(str(full_path), base_dir=app.static_folder, must_exist=True)
-
-    except ValidationError as e:
-        logger.warning(f"Invalid static file request: {filename} - {e}")
-        return jsonify({"error": "Invalid file path"}), 400
-
-    return send_from_directory(app.static_folder, filename)
-
-
 def load_graph_file(graph_type: str) -> Optional[Dict]:
     """
     Load a graph JSON file from the data directory.
@@ -134,17 +202,16 @@ def load_graph_file(graph_type: str) -> Optional[Dict]:
         return None
 
     data_dir = Path(app.config["DATA_DIR"])
-    graph_file = data_dir / f"{graph_type}_graph.json"
+    graph_file = find_graph_file(data_dir, graph_type)
 
     try:
         # Validate file path is within data directory
         validate_file_path(str(graph_file), base_dir=str(data_dir), must_exist=True)
 
         # Validate file size (allow larger graphs for big repositories)
-        validate_file_size(graph_file, max_size_mb=500)
+        validate_file_size(graph_file, max_size_mb=MAX_GRAPH_SIZE_MB)
 
-        with open(graph_file, "r", encoding="utf-8") as f:
-            graph_data = json.load(f)
+        graph_data = read_graph_json(graph_file)
 
         logger.info(
             f"Loaded {graph_type} graph: {len(graph_data.get('nodes', []))} nodes, "
@@ -160,6 +227,47 @@ def load_graph_file(graph_type: str) -> Optional[Dict]:
         return None
 
 
+def load_graph_response_body(graph_type: str) -> Optional[bytes]:
+    """
+    Get a graph as serialized JSON, reusing the last result while the file is unchanged.
+
+    The file is only re-read and re-serialized when its modification time
+    or size differs from the cached entry.
+
+    Args:
+        graph_type: Type of graph ('build' or 'runtime')
+
+    Returns:
+        UTF-8 encoded JSON document, or None if the graph cannot be loaded
+    """
+    if not validate_graph_type(graph_type):
+        logger.warning(f"Invalid graph type requested: {graph_type}")
+        return None
+
+    graph_file = find_graph_file(Path(app.config["DATA_DIR"]), graph_type)
+    cache_key = str(graph_file)
+
+    try:
+        stat = graph_file.stat()
+    except OSError:
+        stat = None
+
+    if stat is not None:
+        cached = _GRAPH_CACHE.get(cache_key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+    graph_data = load_graph_file(graph_type)
+    if graph_data is None:
+        _GRAPH_CACHE.pop(cache_key, None)
+        return None
+
+    body = dumps_json(graph_data)
+    if stat is not None:
+        _GRAPH_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, body)
+    return body
+
+
 @app.route("/api/graphs")
 def list_graphs():
     """
@@ -174,17 +282,16 @@ def list_graphs():
     available_graphs = []
 
     # Check for runtime graph
-    runtime_file = data_dir / "runtime_graph.json"
+    runtime_file = find_graph_file(data_dir, "runtime")
     if runtime_file.exists():
         try:
-            with open(runtime_file, "r", encoding="utf-8") as f:
-                runtime_data = json.load(f)
+            node_count, edge_count = read_graph_counts(runtime_file)
             available_graphs.append(
                 {
                     "type": "runtime",
                     "name": "Runtime Dependencies",
-                    "nodes": len(runtime_data.get("nodes", [])),
-                    "edges": len(runtime_data.get("edges", [])),
+                    "nodes": node_count,
+                    "edges": edge_count,
                     "available": True,
                 }
             )
@@ -209,17 +316,16 @@ def list_graphs():
         )
 
     # Check for build graph
-    build_file = data_dir / "build_graph.json"
+    build_file = find_graph_file(data_dir, "build")
     if build_file.exists():
         try:
-            with open(build_file, "r", encoding="utf-8") as f:
-                build_data = json.load(f)
+            node_count, edge_count = read_graph_counts(build_file)
             available_graphs.append(
                 {
                     "type": "build",
                     "name": "Build Dependencies",
-                    "nodes": len(build_data.get("nodes", [])),
-                    "edges": len(build_data.get("edges", [])),
+                    "nodes": node_count,
+                    "edges": edge_count,
                     "available": True,
                 }
             )
@@ -251,9 +357,9 @@ def get_build_graph():
     """
     logger.info("API request: get build graph")
 
-    graph_data = load_graph_file("build")
+    body = load_graph_response_body("build")
 
-    if graph_data is None:
+    if body is None:
         return (
             jsonify(
                 {
@@ -264,7 +370,7 @@ def get_build_graph():
             404,
         )
 
-    return jsonify(graph_data)
+    return Response(body, mimetype="application/json")
 
 
 @app.route("/api/graph/runtime")
@@ -277,9 +383,9 @@ def get_runtime_graph():
     """
     logger.info("API request: get runtime graph")
 
-    graph_data = load_graph_file("runtime")
+    body = load_graph_response_body("runtime")
 
-    if graph_data is None:
+    if body is None:
         return (
             jsonify(
                 {
@@ -290,7 +396,7 @@ def get_runtime_graph():
             404,
         )
 
-    return jsonify(graph_data)
+    return Response(body, mimetype="application/json")
 
 
 @app.errorhandler(404)
@@ -374,10 +480,17 @@ def handle_exception(error):
     )
 
 
+def _request_log_level() -> int:
+    """Return the level for per-request logs: static assets are only logged at DEBUG."""
+    return logging.DEBUG if request.path.startswith("/static/") else logging.INFO
+
+
 @app.before_request
 def log_request():
     """Log incoming requests for debugging and monitoring."""
-    logger.info(f"{request.method} {request.path} from {request.remote_addr}")
+    level = _request_log_level()
+    if logger.isEnabledFor(level):
+        logger.log(level, "%s %s from %s", request.method, request.path, request.remote_addr)
 
 
 @app.after_request
@@ -391,7 +504,9 @@ def log_response(response):
     Returns:
         Unmodified response object
     """
-    logger.info(f"{request.method} {request.path} -> {response.status_code}")
+    level = _request_log_level()
+    if logger.isEnabledFor(level):
+        logger.log(level, "%s %s -> %s", request.method, request.path, response.status_code)
     return response
 
 
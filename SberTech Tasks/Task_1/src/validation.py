@@ -6,9 +6,11 @@ is properly validated before processing, preventing security vulnerabilities
 like path traversal, injection attacks, and malformed data processing.
 """
 
+import functools
+import os
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 from urllib.parse import urlparse
 
 
@@ -18,6 +20,23 @@ class ValidationError(Exception):
     pass
 
 
+# Allowed package name characters: alphanumeric, dash, underscore, dot, plus.
+# This matches typical RPM package naming conventions
+_PACKAGE_NAME_RE = re.compile(r"^[a-zA-Z0-9._+-]+$")
+
+# Patterns rejected anywhere in a (lowercased) URL
+_SUSPICIOUS_URL_PATTERNS = (
+    r"\.\./",  # Path traversal
+    r"file://",  # Local file access
+    r"javascript:",  # JavaScript injection
+    r"data:",  # Data URLs
+)
+_SUSPICIOUS_URL_RE = re.compile("|".join(_SUSPICIOUS_URL_PATTERNS))
+
+# Control characters other than tab, newline and carriage return
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
 def validate_url(url: str, allowed_schemes: Optional[list] = None) -> str:
     """
     Validate and sanitize a URL.
@@ -68,18 +87,13 @@ def validate_url(url: str, allowed_schemes: Optional[list] = None) -> str:
     if not parsed.netloc:
         raise ValidationError("URL must include a hostname")
 
-    # Check for suspicious patterns
-    suspicious_patterns = [
-        r"\.\./",  # Path traversal
-        r"file://",  # Local file access
-        r"javascript:",  # JavaScript injection
-        r"data:",  # Data URLs
-    ]
-
+    # Check for suspicious patterns in one scan; the slower per-pattern
+    # search only runs to name the pattern in the error message
     url_lower = url.lower()
-    for pattern in suspicious_patterns:
-        if re.search(pattern, url_lower):
-            raise ValidationError(f"URL contains suspicious pattern: {pattern}")
+    if _SUSPICIOUS_URL_RE.search(url_lower):
+        for pattern in _SUSPICIOUS_URL_PATTERNS:
+            if re.search(pattern, url_lower):
+                raise ValidationError(f"URL contains suspicious pattern: {pattern}")
 
     return url
 
@@ -100,6 +114,17 @@ def validate_package_name(name: str) -> str:
     if not name or not isinstance(name, str):
         raise ValidationError("Package name must be a non-empty string")
 
+    return _validate_package_name_str(name)
+
+
+@functools.lru_cache(maxsize=65536)
+def _validate_package_name_str(name: str) -> str:
+    """
+    Validate a non-empty package name string (see validate_package_name).
+
+    Cached because the same names are validated once per package that
+    mentions them; invalid names raise and are therefore not cached.
+    """
     # Remove leading/trailing whitespace
     name = name.strip()
 
@@ -111,8 +136,7 @@ def validate_package_name(name: str) -> str:
         raise ValidationError("Package name exceeds maximum length of 256 characters")
 
     # Validate characters - allow alphanumeric, dash, underscore, dot, plus
-    # This matches typical RPM package naming conventions
-    if not re.match(r"^[a-zA-Z0-9._+-]+$", name):
+    if not _PACKAGE_NAME_RE.match(name):
         raise ValidationError(
             "Package name contains invalid characters. "
             "Only alphanumeric, dash, underscore, dot, and plus are allowed"
@@ -125,6 +149,22 @@ def validate_package_name(name: str) -> str:
     return name
 
 
+@functools.lru_cache(maxsize=32)
+def _resolve_base_dir(base_dir: str) -> Tuple[str, str]:
+    """
+    Resolve a base directory once for repeated containment checks.
+
+    Args:
+        base_dir: Absolute base directory path, so that a relative base is
+            never resolved against a stale working directory
+
+    Returns:
+        (resolved directory, resolved directory with a trailing separator) tuple
+    """
+    base_str = str(Path(base_dir).resolve())
+    return base_str, base_str if base_str.endswith(os.sep) else base_str + os.sep
+
+
 def validate_file_path(
     file_path: str, base_dir: Optional[str] = None, must_exist: bool = False
 ) -> Path:
@@ -155,40 +195,30 @@ def validate_file_path(
     if len(file_path) > 4096:
         raise ValidationError("File path exceeds maximum length of 4096 characters")
 
-    # Convert to Path object
-    try:
-        path = Path(file_path)
-    except Exception as e:
-        raise ValidationError(f"Invalid file path: {e}")
-
     # Resolve to absolute path to detect traversal attempts
     try:
-        resolved_path = path.resolve()
+        resolved_str = os.path.realpath(file_path)
     except Exception as e:
         raise ValidationError(f"Cannot resolve file path: {e}")
 
     # If base_dir specified, ensure path is within it
     if base_dir:
         try:
-            base_path = Path(base_dir).resolve()
-
-            # Check if resolved path is within base directory
-            try:
-                resolved_path.relative_to(base_path)
-            except ValueError:
-                raise ValidationError(
-                    f"File path '{file_path}' is outside allowed directory '{base_dir}'"
-                )
+            base_str, base_prefix = _resolve_base_dir(os.path.abspath(base_dir))
         except Exception as e:
-            if isinstance(e, ValidationError):
-                raise
             raise ValidationError(f"Invalid base directory: {e}")
 
+        # Check if resolved path is within base directory
+        if resolved_str != base_str and not resolved_str.startswith(base_prefix):
+            raise ValidationError(
+                f"File path '{file_path}' is outside allowed directory '{base_dir}'"
+            )
+
     # Check if path must exist
-    if must_exist and not resolved_path.exists():
+    if must_exist and not os.path.exists(resolved_str):
         raise ValidationError(f"File path does not exist: {file_path}")
 
-    return resolved_path
+    return Path(resolved_str)
 
 
 def validate_metadata_string(value: str, field_name: str, max_length: int = 1024) -> str:
@@ -209,17 +239,26 @@ def validate_metadata_string(value: str, field_name: str, max_length: int = 1024
     if not isinstance(value, str):
         raise ValidationError(f"{field_name} must be a string")
 
+    return _validate_metadata_str(value, field_name, max_length)
+
+
+@functools.lru_cache(maxsize=16384)
+def _validate_metadata_str(value: str, field_name: str, max_length: int) -> str:
+    """
+    Validate a metadata string (see validate_metadata_string).
+
+    Cached because architectures, versions and releases repeat across
+    packages; invalid values raise and are therefore not cached.
+    """
     # Check length
     if len(value) > max_length:
         raise ValidationError(f"{field_name} exceeds maximum length of {max_length} characters")
 
-    # Check for null bytes (can cause issues in C libraries)
-    if "\x00" in value:
-        raise ValidationError(f"{field_name} contains null bytes")
-
-    # Check for control characters (except common whitespace)
-    control_chars = set(chr(i) for i in range(32)) - {"\t", "\n", "\r"}
-    if any(c in value for c in control_chars):
+    # Check for control characters (except common whitespace) in one scan;
+    # null bytes (which can cause issues in C libraries) get their own message
+    if _CONTROL_CHARS_RE.search(value):
+        if "\x00" in value:
+            raise ValidationError(f"{field_name} contains null bytes")
         raise ValidationError(f"{field_name} contains invalid control characters")
 
     return value
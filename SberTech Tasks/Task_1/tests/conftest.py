@@ -18,6 +18,23 @@ from tests.fixtures.sample_repository import (
 )
 
 
+def pytest_addoption(parser):
+    """Add the --run-slow command-line option"""
+    parser.addoption(
+        "--run-slow", action="store_true", default=False, help="Run tests marked as slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked as slow unless --run-slow is given"""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, use --run-slow to run it")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 @pytest.fixture
 def temp_cache_dir():
     """Create a temporary cache directory for tests"""
@@ -38,43 +55,43 @@ def sample_package_list():
     return get_sample_package_list()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def linear_dependencies():
     """Provide packages with linear dependencies"""
     return get_linear_dependencies()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def circular_dependencies():
     """Provide packages with circular dependencies"""
     return get_circular_dependencies()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def missing_dependencies():
     """Provide packages with missing dependencies"""
     return get_missing_dependencies()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def complex_dependencies():
     """Provide packages with complex dependencies"""
     return get_complex_dependencies()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def self_loop_dependencies():
     """Provide packages with self-loop dependencies"""
     return get_self_loop_dependencies()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def multiple_circular_dependencies():
     """Provide packages with multiple circular dependency chains"""
     return get_multiple_circular_dependencies()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mixed_runtime_and_build_dependencies():
     """Provide packages with both runtime and build dependencies"""
     return get_mixed_runtime_and_build_dependencies()
@@ -7,6 +7,8 @@ Provides minimal test repository with known dependencies including:
 - Missing dependencies
 """
 
+import functools
+
 from src.repository import PackageInfo
 from src.parser import PackageMetadata, Dependency
 
@@ -170,14 +172,20 @@ def get_sample_package_list():
     ]
 
 
+def _freeze(packages):
+    """Turn a list of (metadata, dependency list) pairs into nested tuples for sharing."""
+    return tuple((metadata, tuple(deps)) for metadata, deps in packages)
+
+
+@functools.lru_cache(maxsize=None)
 def get_linear_dependencies():
     """
     Get packages with simple linear dependencies: A -> B -> C.
 
     Returns:
-        List of tuples (PackageMetadata, List[Dependency])
+        Tuple of (PackageMetadata, Tuple[Dependency, ...]) pairs, built once
     """
-    return [
+    return _freeze([
         (
             PackageMetadata("pkg-a", "1.0.0", "1", "x86_64", False),
             [Dependency("pkg-b", type="requires")],
@@ -187,17 +195,18 @@ def get_linear_dependencies():
             [Dependency("pkg-c", type="requires")],
         ),
         (PackageMetadata("pkg-c", "1.0.0", "1", "x86_64", False), []),
-    ]
+    ])
 
 
+@functools.lru_cache(maxsize=None)
 def get_circular_dependencies():
     """
     Get packages with circular dependencies: A -> B -> C -> A.
 
     Returns:
-        List of tuples (PackageMetadata, List[Dependency])
+        Tuple of (PackageMetadata, Tuple[Dependency, ...]) pairs, built once
     """
-    return [
+    return _freeze([
         (
             PackageMetadata("circular-a", "1.0.0", "1", "x86_64", False),
             [Dependency("circular-b", type="requires")],
@@ -210,17 +219,18 @@ def get_circular_dependencies():
             PackageMetadata("circular-c", "1.0.0", "1", "x86_64", False),
             [Dependency("circular-a", type="requires")],
         ),
-    ]
+    ])
 
 
+@functools.lru_cache(maxsize=None)
 def get_missing_dependencies():
     """
     Get packages with dependencies on non-existent packages.
 
     Returns:
-        List of tuples (PackageMetadata, List[Dependency])
+        Tuple of (PackageMetadata, Tuple[Dependency, ...]) pairs, built once
     """
-    return [
+    return _freeze([
         (
             PackageMetadata("app-with-missing-deps", "1.0.0", "1", "x86_64", False),
             [
@@ -230,9 +240,10 @@ def get_missing_dependencies():
             ],
         ),
         (PackageMetadata("existing-lib", "1.0.0", "1", "x86_64", False), []),
-    ]
+    ])
 
 
+@functools.lru_cache(maxsize=None)
 def get_complex_dependencies():
     """
     Get packages with complex dependency relationships.
@@ -243,9 +254,9 @@ def get_complex_dependencies():
     - Both runtime and build dependencies
 
     Returns:
-        List of tuples (PackageMetadata, List[Dependency])
+        Tuple of (PackageMetadata, Tuple[Dependency, ...]) pairs, built once
     """
-    return [
+    return _freeze([
         # Binary packages with runtime dependencies
         (
             PackageMetadata("web-server", "2.4.0", "1", "x86_64", False),
@@ -284,24 +295,26 @@ def get_complex_dependencies():
                 Dependency("cmake", type="buildrequires"),
             ],
         ),
-    ]
+    ])
 
 
+@functools.lru_cache(maxsize=None)
 def get_self_loop_dependencies():
     """
     Get packages with self-loop dependencies (package depends on itself).
 
     Returns:
-        List of tuples (PackageMetadata, List[Dependency])
+        Tuple of (PackageMetadata, Tuple[Dependency, ...]) pairs, built once
     """
-    return [
+    return _freeze([
         (
             PackageMetadata("self-loop-pkg", "1.0.0", "1", "x86_64", False),
             [Dependency("self-loop-pkg", type="requires")],
         ),
-    ]
+    ])
 
 
+@functools.lru_cache(maxsize=None)
 def get_multiple_circular_dependencies():
     """
     Get packages with multiple independent circular dependency chains.
@@ -310,9 +323,9 @@ def get_multiple_circular_dependencies():
     Chain 2: C -> D -> E -> C
 
     Returns:
-        List of tuples (PackageMetadata, List[Dependency])
+        Tuple of (PackageMetadata, Tuple[Dependency, ...]) pairs, built once
     """
-    return [
+    return _freeze([
         # First circular chain
         (
             PackageMetadata("cycle1-a", "1.0.0", "1", "x86_64", False),
@@ -335,17 +348,18 @@ def get_multiple_circular_dependencies():
             PackageMetadata("cycle2-e", "1.0.0", "1", "x86_64", False),
             [Dependency("cycle2-c", type="requires")],
         ),
-    ]
+    ])
 
 
+@functools.lru_cache(maxsize=None)
 def get_mixed_runtime_and_build_dependencies():
     """
     Get packages with both runtime and build dependencies.
 
     Returns:
-        List of tuples (PackageMetadata, List[Dependency])
+        Tuple of (PackageMetadata, Tuple[Dependency, ...]) pairs, built once
     """
-    return [
+    return _freeze([
         # Binary package with runtime deps
         (
             PackageMetadata("application", "1.0.0", "1", "x86_64", False),
@@ -365,4 +379,4 @@ def get_mixed_runtime_and_build_dependencies():
                 Dependency("make", type="buildrequires"),
             ],
         ),
-    ]
+    ])
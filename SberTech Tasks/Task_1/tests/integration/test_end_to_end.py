@@ -5,7 +5,6 @@ Tests the complete workflow from repository download to graph generation.
 """
 
 import json
-import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import gzip
@@ -67,16 +66,28 @@ SAMPLE_PRIMARY_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
 </metadata>
 """
 
+# Compressed once for every test that serves primary.xml.gz
+SAMPLE_PRIMARY_GZ = gzip.compress(SAMPLE_PRIMARY_XML, compresslevel=1)
+
+
+@pytest.fixture(scope="module")
+def workflow_root(tmp_path_factory):
+    """Create one temporary directory shared by the tests in this module"""
+    return tmp_path_factory.mktemp("e2e")
+
 
 class TestEndToEndWorkflow:
     """Integration tests for complete workflow"""
 
     @pytest.fixture
-    def temp_dirs(self):
-        """Create temporary directories for testing"""
-        with tempfile.TemporaryDirectory() as cache_dir:
-            with tempfile.TemporaryDirectory() as output_dir:
-                yield {"cache": cache_dir, "output": output_dir}
+    def temp_dirs(self, workflow_root, request):
+        """Create per-test cache and output directories under the shared root"""
+        test_dir = workflow_root / request.node.name
+        cache_dir = test_dir / "cache"
+        output_dir = test_dir / "output"
+        cache_dir.mkdir(parents=True)
+        output_dir.mkdir()
+        return {"cache": str(cache_dir), "output": str(output_dir)}
 
     @pytest.fixture
     def sample_package_list(self):
@@ -130,9 +141,9 @@ class TestEndToEndWorkflow:
         repomd_response.content = SAMPLE_REPOMD_XML
         repomd_response.raise_for_status = Mock()
 
-        primary_gz_data = gzip.compress(SAMPLE_PRIMARY_XML)
         primary_response = Mock()
-        primary_response.content = primary_gz_data
+        primary_response.content = SAMPLE_PRIMARY_GZ
+        primary_response.iter_content = Mock(return_value=[SAMPLE_PRIMARY_GZ])
         primary_response.raise_for_status = Mock()
 
         mock_get.side_effect = [repomd_response, primary_response]
@@ -144,8 +155,9 @@ class TestEndToEndWorkflow:
 
         assert cache_path.exists()
         assert len(package_list) == 4
-        assert any(pkg.name == "app-package" and not pkg.is_source for pkg in package_list)
-        assert any(pkg.name == "app-package" and pkg.is_source for pkg in package_list)
+        packages_by_key = {(pkg.name, pkg.is_source): pkg for pkg in package_list}
+        assert ("app-package", False) in packages_by_key
+        assert ("app-package", True) in packages_by_key
 
         # Step 2: Parse packages
         packages_with_deps = parse_packages(package_list)
@@ -335,9 +347,9 @@ class TestEndToEndWorkflow:
         repomd_response.content = SAMPLE_REPOMD_XML
         repomd_response.raise_for_status = Mock()
 
-        primary_gz_data = gzip.compress(SAMPLE_PRIMARY_XML)
         primary_response = Mock()
-        primary_response.content = primary_gz_data
+        primary_response.content = SAMPLE_PRIMARY_GZ
+        primary_response.iter_content = Mock(return_value=[SAMPLE_PRIMARY_GZ])
         primary_response.raise_for_status = Mock()
 
         import requests
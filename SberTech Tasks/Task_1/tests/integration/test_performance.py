@@ -6,7 +6,6 @@ Tests that the system meets performance requirements:
 - Identifies and measures slow operations
 """
 
-import json
 import subprocess
 import sys
 import time
@@ -15,6 +14,9 @@ from typing import Dict, List, Tuple
 
 import pytest
 
+from src.graph import loads_json
+from src.server import read_graph_counts
+
 
 # Use a real repository for performance testing
 TEST_REPO_URL = "https://dl.rockylinux.org/pub/rocky/9/BaseOS/x86_64/os/"
@@ -48,6 +50,7 @@ class TestPerformance:
             shutil.rmtree(perf_cache_dir)
         Path(perf_cache_dir).mkdir(parents=True, exist_ok=True)
 
+        progress_file = Path(perf_output_dir) / "progress.jsonl"
         cmd = [
             sys.executable,
             "-m",
@@ -59,12 +62,14 @@ class TestPerformance:
             "--output-dir",
             str(perf_output_dir),
             "--verbose",
+            "--progress-file",
+            str(progress_file),
         ]
 
         print(f"Running full workflow...")
         print(f"Repository: {TEST_REPO_URL}")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             result = subprocess.run(
@@ -76,7 +81,7 @@ class TestPerformance:
         except subprocess.TimeoutExpired:
             pytest.fail("Processing exceeded 10 minute timeout (requirement 1.5)")
 
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.perf_counter() - start_time
         minutes = int(elapsed_time // 60)
         seconds = int(elapsed_time % 60)
 
@@ -103,15 +108,18 @@ class TestPerformance:
                 f"violating requirement 1.5"
             )
 
-        # Parse output to identify slow operations
+        # Per-phase timings recorded by --progress-file identify slow operations
         print(f"\n{'='*70}")
         print(f"OPERATION BREAKDOWN:")
         print(f"{'='*70}")
 
-        output_lines = result.stdout.split("\n")
-        for line in output_lines:
-            if "Progress:" in line or "Processing time:" in line or "elapsed" in line.lower():
-                print(f"  {line.strip()}")
+        with open(progress_file, "rb") as f:
+            phases = [loads_json(line) for line in f]
+        for record in phases:
+            share = record["elapsed"] / elapsed_time * 100
+            print(f"  {record['phase']:<10} {record['elapsed']:>8.2f}s  ({share:.1f}%)")
+
+        assert [record["phase"] for record in phases] == ["download", "parse", "build", "save"]
 
     def test_02_measure_cached_workflow_time(self, perf_cache_dir, perf_output_dir):
         """Measure processing time with cached data."""
@@ -134,7 +142,7 @@ class TestPerformance:
 
         print(f"Running workflow with cached data...")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             result = subprocess.run(
@@ -146,7 +154,7 @@ class TestPerformance:
         except subprocess.TimeoutExpired:
             pytest.fail("Cached processing exceeded 10 minute timeout")
 
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.perf_counter() - start_time
         minutes = int(elapsed_time // 60)
         seconds = int(elapsed_time % 60)
 
@@ -174,11 +182,7 @@ class TestPerformance:
             pytest.skip("Graph files not found, skipping size analysis")
 
         # Analyze runtime graph
-        with open(runtime_graph_path, "r", encoding="utf-8") as f:
-            runtime_data = json.load(f)
-
-        runtime_nodes = len(runtime_data.get("nodes", []))
-        runtime_edges = len(runtime_data.get("edges", []))
+        runtime_nodes, runtime_edges = read_graph_counts(runtime_graph_path)
         runtime_size = runtime_graph_path.stat().st_size
 
         print(f"\nRuntime Graph:")
@@ -191,11 +195,7 @@ class TestPerformance:
             print(f"  Avg edges per node: {avg_edges_per_node:.2f}")
 
         # Analyze build graph
-        with open(build_graph_path, "r", encoding="utf-8") as f:
-            build_data = json.load(f)
-
-        build_nodes = len(build_data.get("nodes", []))
-        build_edges = len(build_data.get("edges", []))
+        build_nodes, build_edges = read_graph_counts(build_graph_path)
         build_size = build_graph_path.stat().st_size
 
         print(f"\nBuild Graph:")
@@ -221,18 +221,10 @@ class TestPerformance:
         if not runtime_graph_path.exists() or not build_graph_path.exists():
             pytest.skip("Graph files not found, skipping memory analysis")
 
-        # Load graphs and estimate memory
-        with open(runtime_graph_path, "r", encoding="utf-8") as f:
-            runtime_data = json.load(f)
-
-        with open(build_graph_path, "r", encoding="utf-8") as f:
-            build_data = json.load(f)
-
-        # Rough memory estimation
-        runtime_nodes = len(runtime_data.get("nodes", []))
-        runtime_edges = len(runtime_data.get("edges", []))
-        build_nodes = len(build_data.get("nodes", []))
-        build_edges = len(build_data.get("edges", []))
+        # Counts are cached per file by read_graph_counts, so the graphs
+        # analyzed in test_03 are not parsed again
+        runtime_nodes, runtime_edges = read_graph_counts(runtime_graph_path)
+        build_nodes, build_edges = read_graph_counts(build_graph_path)
 
         # Estimate: ~200 bytes per node, ~100 bytes per edge (rough average)
         estimated_runtime_mem = (runtime_nodes * 200 + runtime_edges * 100) / 1024 / 1024
@@ -8,16 +8,19 @@ This test validates the entire system end-to-end:
 4. Tests web interface with real data
 """
 
-import json
 import os
 import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, List, Set
+from unittest.mock import patch
 
 import pytest
 
+from src.graph import loads_json
+from src.server import app, read_graph_counts
+
 
 # Use a small, stable public RPM repository for testing
 # OpenScaler repository (smaller and tested to work)
@@ -31,6 +34,25 @@ FALLBACK_REPOS = [
 ]
 
 
+def _collect_node_ids(nodes: List[Dict[str, Any]]) -> Set[str]:
+    """Check that every node has an id and label, returning the set of ids."""
+    node_ids = set()
+    for node in nodes:
+        assert "id" in node, "Node missing 'id' field"
+        assert "label" in node, f"Node '{node['id']}' missing 'label' field"
+        node_ids.add(node["id"])
+    return node_ids
+
+
+def _check_edges(edges: List[Dict[str, Any]], node_ids: Set[str]) -> None:
+    """Check that every edge has a source and target that are known nodes."""
+    for edge in edges:
+        assert "source" in edge, "Edge missing 'source' field"
+        assert "target" in edge, "Edge missing 'target' field"
+        assert edge["source"] in node_ids, f"Edge source '{edge['source']}' not in nodes"
+        assert edge["target"] in node_ids, f"Edge target '{edge['target']}' not in nodes"
+
+
 class TestRealRepositoryWorkflow:
     """Test complete workflow with a real RPM repository."""
 
@@ -114,9 +136,10 @@ class TestRealRepositoryWorkflow:
             )
 
         # Verify cache directory has content
-        cache_files = list(Path(test_cache_dir).glob("*"))
-        assert len(cache_files) > 0, "Cache directory is empty"
-        print(f"\n✓ Cache directory contains {len(cache_files)} files")
+        with os.scandir(test_cache_dir) as entries:
+            cache_file_count = sum(1 for _ in entries)
+        assert cache_file_count > 0, "Cache directory is empty"
+        print(f"\n✓ Cache directory contains {cache_file_count} files")
 
     def test_02_verify_graph_files_created(self, test_output_dir):
         """Verify that both graph files were created."""
@@ -153,8 +176,7 @@ class TestRealRepositoryWorkflow:
 
         runtime_graph_path = Path(test_output_dir) / "runtime_graph.json"
 
-        with open(runtime_graph_path, "r", encoding="utf-8") as f:
-            graph_data = json.load(f)
+        graph_data = loads_json(runtime_graph_path.read_bytes())
 
         # Verify graph type
         assert graph_data.get("graph_type") == "runtime", "Invalid graph type"
@@ -173,24 +195,14 @@ class TestRealRepositoryWorkflow:
         assert isinstance(edges, list), "Edges should be a list"
         print(f"✓ Runtime graph has {len(edges)} edges")
 
-        # Verify node structure
-        sample_node = nodes[0]
-        assert "id" in sample_node, "Node missing 'id' field"
-        assert "label" in sample_node, "Node missing 'label' field"
-        print(f"✓ Sample node: {sample_node['id']}")
+        # Verify node structure, collecting the ids in the same pass
+        node_ids = _collect_node_ids(nodes)
+        print(f"✓ Sample node: {nodes[0]['id']}")
 
-        # Verify edge structure (if edges exist)
+        # Verify edge structure and that every reference points to a valid node
+        _check_edges(edges, node_ids)
         if len(edges) > 0:
-            sample_edge = edges[0]
-            assert "source" in sample_edge, "Edge missing 'source' field"
-            assert "target" in sample_edge, "Edge missing 'target' field"
-            print(f"✓ Sample edge: {sample_edge['source']} -> {sample_edge['target']}")
-
-        # Verify all edge references point to valid nodes
-        node_ids = {node["id"] for node in nodes}
-        for edge in edges:
-            assert edge["source"] in node_ids, f"Edge source '{edge['source']}' not in nodes"
-            assert edge["target"] in node_ids, f"Edge target '{edge['target']}' not in nodes"
+            print(f"✓ Sample edge: {edges[0]['source']} -> {edges[0]['target']}")
         print(f"✓ All edge references are valid")
 
     def test_04_verify_build_graph_structure(self, test_output_dir):
@@ -201,8 +213,7 @@ class TestRealRepositoryWorkflow:
 
         build_graph_path = Path(test_output_dir) / "build_graph.json"
 
-        with open(build_graph_path, "r", encoding="utf-8") as f:
-            graph_data = json.load(f)
+        graph_data = loads_json(build_graph_path.read_bytes())
 
         # Verify graph type
         assert graph_data.get("graph_type") == "build", "Invalid graph type"
@@ -227,17 +238,12 @@ class TestRealRepositoryWorkflow:
         assert isinstance(edges, list), "Edges should be a list"
         print(f"✓ Build graph has {len(edges)} edges")
 
-        # Verify node structure
-        sample_node = nodes[0]
-        assert "id" in sample_node, "Node missing 'id' field"
-        assert "label" in sample_node, "Node missing 'label' field"
-        print(f"✓ Sample node: {sample_node['id']}")
-
-        # Verify all edge references point to valid nodes
-        node_ids = {node["id"] for node in nodes}
-        for edge in edges:
-            assert edge["source"] in node_ids, f"Edge source '{edge['source']}' not in nodes"
-            assert edge["target"] in node_ids, f"Edge target '{edge['target']}' not in nodes"
+        # Verify node structure, collecting the ids in the same pass
+        node_ids = _collect_node_ids(nodes)
+        print(f"✓ Sample node: {nodes[0]['id']}")
+
+        # Verify edge structure and that every reference points to a valid node
+        _check_edges(edges, node_ids)
         print(f"✓ All edge references are valid")
 
     def test_05_verify_graph_completeness(self, test_output_dir):
@@ -249,16 +255,9 @@ class TestRealRepositoryWorkflow:
         runtime_graph_path = Path(test_output_dir) / "runtime_graph.json"
         build_graph_path = Path(test_output_dir) / "build_graph.json"
 
-        with open(runtime_graph_path, "r", encoding="utf-8") as f:
-            runtime_data = json.load(f)
-
-        with open(build_graph_path, "r", encoding="utf-8") as f:
-            build_data = json.load(f)
-
-        runtime_nodes = len(runtime_data["nodes"])
-        runtime_edges = len(runtime_data["edges"])
-        build_nodes = len(build_data["nodes"])
-        build_edges = len(build_data["edges"])
+        # Only the counts are needed here, not the node and edge lists
+        runtime_nodes, runtime_edges = read_graph_counts(runtime_graph_path)
+        build_nodes, build_edges = read_graph_counts(build_graph_path)
 
         # Real repositories should have at least some packages
         # Runtime graph should have data for binary repositories
@@ -284,108 +283,57 @@ class TestRealRepositoryWorkflow:
             print(f"✓ Build graph density: {density:.4f}")
 
     def test_06_test_web_server_startup(self, test_output_dir):
-        """Test that web server can start and serve the graphs."""
+        """Test that the web application serves the graphs."""
         print(f"\n{'='*70}")
         print("TEST 6: Testing Web Server")
         print(f"{'='*70}")
 
-        # Copy graph files to default data directory for server
-        import shutil
-
-        data_dir = Path("data")
-        data_dir.mkdir(exist_ok=True)
-
-        runtime_src = Path(test_output_dir) / "runtime_graph.json"
-        build_src = Path(test_output_dir) / "build_graph.json"
-        runtime_dst = data_dir / "runtime_graph.json"
-        build_dst = data_dir / "build_graph.json"
-
-        shutil.copy2(runtime_src, runtime_dst)
-        shutil.copy2(build_src, build_dst)
-        print(f"✓ Copied graph files to {data_dir}")
-
-        # Start server in background
-        server_process = subprocess.Popen(
-            [sys.executable, "-m", "src.server"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-
-        try:
-            # Wait for server to start
-            print("Waiting for server to start...")
-            time.sleep(3)
-
-            # Check if server is running
-            if server_process.poll() is not None:
-                stdout, stderr = server_process.communicate()
-                pytest.fail(f"Server failed to start. Error: {stderr}")
-
-            print("✓ Server started successfully")
-
-            # Test API endpoints using requests
-            try:
-                import requests
-
-                base_url = "http://localhost:5000"
-
-                # Test main page
-                response = requests.get(base_url, timeout=5)
-                assert response.status_code == 200, f"Main page returned {response.status_code}"
-                print(f"✓ Main page accessible (status: {response.status_code})")
-
-                # Test graphs list endpoint
-                response = requests.get(f"{base_url}/api/graphs", timeout=5)
-                assert response.status_code == 200, f"Graphs API returned {response.status_code}"
-                graphs_data = response.json()
-                assert "graphs" in graphs_data, "Missing 'graphs' field in response"
-                print(f"✓ Graphs API accessible: {len(graphs_data['graphs'])} graphs available")
-
-                # Test runtime graph endpoint
-                response = requests.get(f"{base_url}/api/graph/runtime", timeout=5)
-                assert (
-                    response.status_code == 200
-                ), f"Runtime graph API returned {response.status_code}"
-                runtime_data = response.json()
-                assert "nodes" in runtime_data, "Missing 'nodes' in runtime graph"
-                print(f"✓ Runtime graph API accessible: {len(runtime_data['nodes'])} nodes")
-
-                # Test build graph endpoint
-                response = requests.get(f"{base_url}/api/graph/build", timeout=5)
-                assert (
-                    response.status_code == 200
-                ), f"Build graph API returned {response.status_code}"
-                build_data = response.json()
-                assert "nodes" in build_data, "Missing 'nodes' in build graph"
-                print(f"✓ Build graph API accessible: {len(build_data['nodes'])} nodes")
-
-            except ImportError:
-                print("⚠ requests library not available, skipping HTTP tests")
-            except Exception as e:
-                pytest.fail(f"HTTP request failed: {e}")
-
-        finally:
-            # Stop server
-            server_process.terminate()
-            try:
-                server_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                server_process.kill()
-            print("✓ Server stopped")
-
-    def test_07_verify_processing_time(self, test_cache_dir, test_output_dir):
+        # Serve the generated graphs in-process through Flask's test client
+        with patch.dict(app.config, {"DATA_DIR": str(test_output_dir)}):
+            client = app.test_client()
+            print(f"✓ Serving graph files from {test_output_dir}")
+
+            # Test main page
+            response = client.get("/")
+            assert response.status_code == 200, f"Main page returned {response.status_code}"
+            print(f"✓ Main page accessible (status: {response.status_code})")
+
+            # Test graphs list endpoint
+            response = client.get("/api/graphs")
+            assert response.status_code == 200, f"Graphs API returned {response.status_code}"
+            graphs_data = response.get_json()
+            assert "graphs" in graphs_data, "Missing 'graphs' field in response"
+            print(f"✓ Graphs API accessible: {len(graphs_data['graphs'])} graphs available")
+
+            # Test runtime graph endpoint
+            response = client.get("/api/graph/runtime")
+            assert (
+                response.status_code == 200
+            ), f"Runtime graph API returned {response.status_code}"
+            runtime_data = response.get_json()
+            assert "nodes" in runtime_data, "Missing 'nodes' in runtime graph"
+            print(f"✓ Runtime graph API accessible: {len(runtime_data['nodes'])} nodes")
+
+            # Test build graph endpoint
+            response = client.get("/api/graph/build")
+            assert (
+                response.status_code == 200
+            ), f"Build graph API returned {response.status_code}"
+            build_data = response.get_json()
+            assert "nodes" in build_data, "Missing 'nodes' in build graph"
+            print(f"✓ Build graph API accessible: {len(build_data['nodes'])} nodes")
+
+    @pytest.mark.slow
+    def test_07_verify_processing_time(self, tmp_path_factory):
         """Verify that processing completes within 10 minutes (requirement 1.5)."""
         print(f"\n{'='*70}")
         print("TEST 7: Verifying Processing Time")
         print(f"{'='*70}")
 
-        # Clear cache to test full processing time
-        import shutil
-
-        if Path(test_cache_dir).exists():
-            shutil.rmtree(test_cache_dir)
-        Path(test_cache_dir).mkdir(parents=True, exist_ok=True)
+        # Time a full run from an empty cache of its own, leaving the class-scoped
+        # cache and graphs from test_01 untouched for the other tests
+        test_cache_dir = tmp_path_factory.mktemp("timing_cache")
+        test_output_dir = tmp_path_factory.mktemp("timing_output")
 
         # Run with timing
         cmd = [
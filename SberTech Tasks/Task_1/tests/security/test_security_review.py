@@ -10,6 +10,7 @@ Tests all security requirements:
 """
 
 import os
+import re
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -28,6 +29,15 @@ from src.validation import (
 from src.repository import RepositoryDownloader, RepositoryDownloadError
 from src.file_utils import safe_write, safe_read
 
+# Calls that execute arbitrary code, matched in one scan per source file
+DANGEROUS_CALL_RE = re.compile(r"eval\(|exec\(|__import__\(|shell\s*=\s*True")
+
+
+@pytest.fixture(scope="module")
+def src_sources():
+    """Read every Python file in src/ once for the source-scanning tests"""
+    return [(py_file.name, py_file.read_text()) for py_file in Path("src").glob("*.py")]
+
 
 class TestInputValidation:
     """Test input validation security (requirement 6.1)."""
@@ -245,39 +255,19 @@ class TestSafeFileOperations:
 class TestNoArbitraryCodeExecution:
     """Test that no arbitrary code is executed (requirement 6.3)."""
 
-    def test_no_eval_or_exec_in_codebase(self):
-        """Test that eval() and exec() are not used in the codebase."""
+    def test_no_eval_or_exec_in_codebase(self, src_sources):
+        """Test that eval(), exec() and shell=True are not used in the codebase."""
         print("\n[Security Test] No Arbitrary Code Execution")
 
         # Check all Python files in src directory
-        src_dir = Path("src")
-        dangerous_functions = ["eval(", "exec(", "__import__("]
-
-        violations = []
-        for py_file in src_dir.glob("*.py"):
-            content = py_file.read_text()
-            for func in dangerous_functions:
-                if func in content:
-                    violations.append(f"{py_file.name}: {func}")
+        violations = [
+            f"{name}: {func}"
+            for name, content in src_sources
+            for func in sorted(set(DANGEROUS_CALL_RE.findall(content)))
+        ]
 
         assert len(violations) == 0, f"Found dangerous functions: {violations}"
-        print("✓ No eval() or exec() found in codebase")
-
-    def test_no_shell_injection_in_subprocess(self):
-        """Test that subprocess calls don't use shell=True."""
-        print("\n[Security Test] No Shell Injection")
-
-        # Check all Python files for subprocess with shell=True
-        src_dir = Path("src")
-        violations = []
-
-        for py_file in src_dir.glob("*.py"):
-            content = py_file.read_text()
-            if "subprocess" in content and "shell=True" in content:
-                violations.append(py_file.name)
-
-        assert len(violations) == 0, f"Found shell=True in: {violations}"
-        print("✓ No shell=True in subprocess calls")
+        print("✓ No eval(), exec() or shell=True found in codebase")
 
 
 class TestSecureDownloads:
@@ -4,7 +4,7 @@ Unit tests for dependency extractor module.
 
 import pytest
 
-from src.extractor import DependencyExtractor
+from src.extractor import DependencyExtractor, PackageTable
 from src.parser import PackageMetadata, Dependency
 
 
@@ -250,3 +250,63 @@ class TestDependencyExtractor:
 
         assert "no-deps-package" in runtime_deps
         assert runtime_deps["no-deps-package"] == []
+
+    def test_extract_with_shared_table(self, extractor, sample_packages_with_deps):
+        """Test that a prebuilt PackageTable gives the same results as building one"""
+        table = PackageTable.from_packages(sample_packages_with_deps)
+
+        assert extractor.extract_runtime_deps(
+            sample_packages_with_deps, table
+        ) == DependencyExtractor().extract_runtime_deps(sample_packages_with_deps)
+        assert extractor.extract_build_deps(
+            sample_packages_with_deps, table
+        ) == DependencyExtractor().extract_build_deps(sample_packages_with_deps)
+
+    def test_extract_sees_in_place_list_changes(self, extractor):
+        """Test that edits to the same list are picked up by later calls"""
+        packages_with_deps = [
+            (PackageMetadata("first", "1.0", "1", "x86_64", False), []),
+        ]
+        assert set(extractor.extract_runtime_deps(packages_with_deps)) == {"first"}
+
+        packages_with_deps.append(
+            (PackageMetadata("second", "1.0", "1", "x86_64", False), []),
+        )
+        assert set(extractor.extract_runtime_deps(packages_with_deps)) == {"first", "second"}
+
+
+class TestPackageTable:
+    """Tests for PackageTable class"""
+
+    def test_from_packages(self):
+        """Test that rows keep per-package requires and provides"""
+        packages_with_deps = [
+            (
+                PackageMetadata("app", "1.0", "1", "x86_64", False),
+                [
+                    Dependency(name="lib", type="requires"),
+                    Dependency(name="gcc", type="buildrequires"),
+                    Dependency(name="app", type="provides"),
+                ],
+            ),
+            (PackageMetadata("empty", "1.0", "1", "x86_64", False), []),
+            (
+                PackageMetadata("app", "1.0", "1", "src", True),
+                [
+                    Dependency(name="gcc", type="buildrequires"),
+                    Dependency(name="make", type="requires"),
+                ],
+            ),
+        ]
+
+        table = PackageTable.from_packages(packages_with_deps)
+
+        assert len(table) == 3
+        assert table.names == ["app", "empty", "app"]
+        assert table.is_source == [False, False, True]
+        # buildrequires of binary packages are ignored
+        assert table.package_requires(0) == ["lib"]
+        assert table.package_provides(0) == ["app"]
+        assert table.package_requires(1) == []
+        assert table.package_requires(2) == ["gcc", "make"]
+        assert table.package_provides(2) == []
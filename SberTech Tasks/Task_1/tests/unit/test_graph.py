@@ -2,9 +2,10 @@
 Unit tests for the graph builder module.
 """
 
+import io
 import pytest
 import json
-from src.graph import DependencyGraph, Node, Edge, NodeColor
+from src.graph import DependencyGraph, Node, Edge, NodeColor, dumps_json, loads_json
 
 
 class TestNode:
@@ -167,6 +168,54 @@ class TestDependencyGraph:
         cycles = graph.detect_cycles()
         assert len(cycles) == 2
 
+    def test_detect_cycles_deep_chain(self):
+        """Test cycle detection on a chain deeper than the recursion limit."""
+        import sys
+
+        depth = sys.getrecursionlimit() * 2
+        graph = DependencyGraph()
+        dependencies = {f"pkg-{i}": [f"pkg-{i + 1}"] for i in range(depth)}
+        dependencies[f"pkg-{depth}"] = ["pkg-0"]
+        graph.build_graph(dependencies)
+
+        cycles = graph.detect_cycles()
+        assert len(cycles) == 1
+        assert len(cycles[0]) == depth + 2
+        assert cycles[0][0] == cycles[0][-1] == "pkg-0"
+
+    def test_detect_cycles_cached_until_modified(self):
+        """Test that cycle detection results are reused until the graph changes."""
+        graph = DependencyGraph()
+        graph.build_graph({"pkg-a": ["pkg-b"], "pkg-b": ["pkg-a"]})
+
+        cycles = graph.detect_cycles()
+        assert graph.detect_cycles() is cycles
+
+        graph.add_edge("pkg-c", "pkg-c")
+        assert len(graph.detect_cycles()) == 2
+
+    def test_has_cycle(self):
+        """Test the early-exit cycle check."""
+        acyclic = DependencyGraph()
+        acyclic.build_graph({"pkg-a": ["pkg-b"], "pkg-b": []})
+        assert acyclic.has_cycle() is False
+        assert DependencyGraph().has_cycle() is False
+
+        cyclic = DependencyGraph()
+        cyclic.build_graph({"pkg-a": ["pkg-b"], "pkg-b": ["pkg-a"]})
+        assert cyclic.has_cycle() is True
+
+    def test_count_cycles(self):
+        """Test counting cycles with and without a limit."""
+        graph = DependencyGraph()
+        graph.build_graph(
+            {"pkg-a": ["pkg-b"], "pkg-b": ["pkg-a"], "pkg-c": ["pkg-d"], "pkg-d": ["pkg-c"]}
+        )
+
+        assert graph.count_cycles(limit=1) == 1
+        assert graph.count_cycles() == 2
+        assert graph.count_cycles(limit=5) == 2
+
     def test_export_to_json(self):
         """Test JSON serialization of the graph."""
         graph = DependencyGraph()
@@ -188,6 +237,24 @@ class TestDependencyGraph:
         assert edge["source"] == "pkg-a"
         assert edge["target"] == "pkg-b"
 
+    def test_export_to_json_stream(self):
+        """Test streaming JSON export matches the in-memory export."""
+        graph = DependencyGraph()
+        dependencies = {"pkg-a": ["pkg-b", "pkg-c"], "pkg-b": ["pkg-c"], "pkg-c": []}
+        graph.build_graph(dependencies)
+
+        buffer = io.BytesIO()
+        graph.export_to_json_stream(buffer, graph_type="runtime")
+
+        assert json.loads(buffer.getvalue()) == graph.to_dict("runtime")
+
+        empty = io.BytesIO()
+        DependencyGraph().export_to_json_stream(empty, graph_type="build")
+        assert json.loads(empty.getvalue()) == {"graph_type": "build", "nodes": [], "edges": []}
+
+        with pytest.raises(ValueError):
+            graph.export_to_json_stream(io.BytesIO(), graph_type="")
+
     def test_to_dict(self):
         """Test dictionary conversion of the graph."""
         graph = DependencyGraph()
@@ -199,3 +266,39 @@ class TestDependencyGraph:
         assert graph_dict["graph_type"] == "build"
         assert len(graph_dict["nodes"]) == 3
         assert len(graph_dict["edges"]) == 2
+
+
+class TestDumpsJson:
+    """Tests for the dumps_json helper."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_matches_stdlib_output(self, monkeypatch, use_orjson):
+        """Test that output is identical with and without orjson."""
+        import src.graph as graph_module
+
+        if not use_orjson:
+            monkeypatch.setattr(graph_module, "orjson", None)
+        elif graph_module.orjson is None:
+            pytest.skip("orjson not installed")
+
+        data = {"graph_type": "runtime", "nodes": [{"id": "пакет", "n": 1}], "edges": []}
+
+        expected = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        assert dumps_json(data, indent=True) == expected
+        assert json.loads(dumps_json(data)) == data
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_loads_json_round_trip(self, monkeypatch, use_orjson):
+        """Test that loads_json parses the same data with and without orjson."""
+        import src.graph as graph_module
+
+        if not use_orjson:
+            monkeypatch.setattr(graph_module, "orjson", None)
+        elif graph_module.orjson is None:
+            pytest.skip("orjson not installed")
+
+        data = {"graph_type": "build", "nodes": [{"id": "пакет"}], "edges": []}
+
+        assert loads_json(dumps_json(data)) == data
+        with pytest.raises(json.JSONDecodeError):
+            loads_json(b"{ invalid json }")
@@ -15,6 +15,7 @@ from src.main import (
     build_dependency_graphs,
     save_graphs,
     clear_cache,
+    main,
     PackageProcessingError,
 )
 from src.repository import PackageInfo, RepositoryDownloadError
@@ -158,6 +159,29 @@ class TestBuildDependencyGraphs:
         cycles = runtime_graph.detect_cycles()
         assert len(cycles) > 0
 
+    def test_build_graphs_runtime_and_build(self):
+        """Test that runtime and build graphs are built from the same package list"""
+        packages_with_deps = [
+            (
+                PackageMetadata("pkg-a", "1.0", "1", "x86_64", False),
+                [Dependency("pkg-b", type="requires")],
+            ),
+            (
+                PackageMetadata("pkg-b", "1.0", "1", "x86_64", False),
+                [Dependency("pkg-a", type="requires")],
+            ),
+            (
+                PackageMetadata("pkg-a", "1.0", "1", "src", True),
+                [Dependency("gcc", type="buildrequires")],
+            ),
+        ]
+
+        runtime_graph, build_graph = build_dependency_graphs(packages_with_deps)
+
+        assert "pkg-b" in runtime_graph.get_dependencies("pkg-a")
+        assert len(runtime_graph.detect_cycles()) == 1
+        assert build_graph.has_node("gcc")
+
 
 class TestSaveGraphs:
     """Tests for save_graphs function"""
@@ -181,6 +205,40 @@ class TestSaveGraphs:
             assert build_file.exists()
             assert summary_file.exists()
 
+    def test_save_graphs_compressed(self):
+        """Test that compressed output replaces the plain JSON files"""
+        import json
+
+        zstd = pytest.importorskip("zstandard")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runtime_graph = DependencyGraph()
+            runtime_graph.add_edge("pkg1", "pkg2")
+            build_graph = DependencyGraph()
+
+            save_graphs(runtime_graph, build_graph, output_dir=tmpdir)
+            save_graphs(runtime_graph, build_graph, output_dir=tmpdir, compress=True)
+
+            runtime_file = Path(tmpdir) / "runtime_graph.json.zst"
+            assert runtime_file.exists()
+            assert (Path(tmpdir) / "build_graph.json.zst").exists()
+            assert not (Path(tmpdir) / "runtime_graph.json").exists()
+
+            with open(runtime_file, "rb") as f:
+                data = json.loads(zstd.ZstdDecompressor().stream_reader(f).read())
+            assert data == runtime_graph.to_dict("runtime")
+
+    def test_save_graphs_compressed_without_zstandard(self):
+        """Test that a missing zstandard library is reported with its ImportError"""
+        import sys
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.dict(sys.modules, {"zstandard": None}):
+                with pytest.raises(PackageProcessingError, match="zstandard") as exc_info:
+                    save_graphs(DependencyGraph(), DependencyGraph(), tmpdir, compress=True)
+
+        assert isinstance(exc_info.value.__cause__, ImportError)
+
     def test_save_graphs_creates_output_dir(self):
         """Test that save_graphs creates output directory if it doesn't exist"""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -233,6 +291,18 @@ class TestClearCache:
             assert not cache_file1.exists()
             assert not cache_file2.exists()
 
+    def test_clear_cache_keeps_subdirectories(self):
+        """Test that clear_cache only removes regular files"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "cache.xml").write_text("test")
+            subdir = Path(tmpdir) / "nested"
+            subdir.mkdir()
+
+            clear_cache(cache_dir=tmpdir)
+
+            assert not (Path(tmpdir) / "cache.xml").exists()
+            assert subdir.is_dir()
+
     def test_clear_cache_nonexistent_dir(self):
         """Test that clear_cache handles non-existent directory"""
         # Should not raise an error
@@ -278,6 +348,7 @@ class TestDownloadRepository:
 
         primary_response = Mock()
         primary_response.content = gzip.compress(primary_xml)
+        primary_response.iter_content = Mock(return_value=[primary_response.content])
         primary_response.raise_for_status = Mock()
 
         mock_get.side_effect = [repomd_response, primary_response]
@@ -301,3 +372,44 @@ class TestDownloadRepository:
         with tempfile.TemporaryDirectory() as tmpdir:
             with pytest.raises(RepositoryDownloadError):
                 download_repository("https://example.com/repo", cache_dir=tmpdir)
+
+
+class TestMain:
+    """Tests for the command-line entry point"""
+
+    @patch("src.main.save_graphs")
+    @patch("src.main.build_dependency_graphs")
+    @patch("src.main.parse_packages")
+    @patch("src.main.download_repository")
+    @patch("src.main.setup_logging")
+    def test_main_writes_progress_file(
+        self, mock_logging, mock_download, mock_parse, mock_build, mock_save
+    ):
+        """Test that --progress-file records one JSON line per workflow phase"""
+        import json
+
+        package = PackageInfo("pkg1", "1.0", "1", "x86_64", "Packages/pkg1.rpm", "", False)
+        mock_download.return_value = (Path("primary.xml"), [package])
+        mock_parse.return_value = [(Mock(), [])]
+        mock_build.return_value = (DependencyGraph(), DependencyGraph())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            progress_file = Path(tmpdir) / "progress.jsonl"
+            progress_file.write_text("stale\n")
+
+            exit_code = main(
+                [
+                    "--repo-url",
+                    "https://example.com/repo",
+                    "--output-dir",
+                    tmpdir,
+                    "--progress-file",
+                    str(progress_file),
+                ]
+            )
+
+            records = [json.loads(line) for line in progress_file.read_text().splitlines()]
+
+        assert exit_code == 0
+        assert [record["phase"] for record in records] == ["download", "parse", "build", "save"]
+        assert all(record["elapsed"] >= 0 for record in records)
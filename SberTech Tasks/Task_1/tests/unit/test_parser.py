@@ -182,6 +182,23 @@ class TestRPMParser:
         assert metadata.arch == "src"
         assert metadata.is_source is True
 
+    def test_parse_rpm_full_matches_separate_calls(self, parser, temp_rpm_dir):
+        """Test that the single-pass parse returns the same results"""
+        rpm_path = temp_rpm_dir / "test-package.rpm"
+        create_minimal_rpm_file(
+            rpm_path, name="test-package", version="1.0.0", release="1", arch="x86_64"
+        )
+
+        metadata, dependencies = parser.parse_rpm_full(rpm_path)
+
+        assert metadata == parser.parse_rpm_header(rpm_path)
+        assert dependencies == parser.extract_dependencies(rpm_path)
+
+    def test_parse_rpm_full_nonexistent_file(self, parser):
+        """Test that the single-pass parse validates the file path"""
+        with pytest.raises(RPMParsingError, match="Invalid RPM file"):
+            parser.parse_rpm_full(Path("/nonexistent/file.rpm"))
+
     def test_extract_dependencies_from_nonexistent_file(self, parser):
         """Test that extracting dependencies from nonexistent file raises error"""
         nonexistent = Path("/nonexistent/file.rpm")
@@ -274,6 +291,33 @@ class TestRPMParser:
             assert len(requires_deps) >= 2
             assert len(provides_deps) >= 1
 
+    def test_rpm_library_transaction_set_reused(self, temp_rpm_dir):
+        """Test that one rpm transaction set serves all header reads"""
+        parser = RPMParser()
+
+        with patch.dict("sys.modules", {"rpm": MagicMock()}):
+            import sys
+
+            mock_rpm = sys.modules["rpm"]
+            mock_ts = MagicMock()
+            mock_rpm.TransactionSet.return_value = mock_ts
+            mock_rpm._RPMVSF_NOSIGNATURES = 0
+            mock_ts.hdrFromFdno.return_value = {
+                mock_rpm.RPMTAG_NAME: b"test-pkg",
+                mock_rpm.RPMTAG_VERSION: b"1.0",
+                mock_rpm.RPMTAG_RELEASE: b"1",
+                mock_rpm.RPMTAG_ARCH: b"x86_64",
+            }
+
+            rpm_path = temp_rpm_dir / "test.rpm"
+            rpm_path.write_bytes(b"dummy")
+
+            parser._parse_with_rpm_library(rpm_path)
+            parser._parse_with_rpm_library(rpm_path)
+
+            assert mock_rpm.TransactionSet.call_count == 1
+            assert mock_ts.hdrFromFdno.call_count == 2
+
     def test_get_header_string_missing_tag(self, parser):
         """Test getting string from header with missing tag"""
         header_data = {}
@@ -286,12 +330,45 @@ class TestRPMParser:
         result = parser._get_header_string_array(header_data, 1000)
         assert result == []
 
+    def test_get_header_string_array(self, parser):
+        """Test decoding NUL-terminated string arrays from header data"""
+        data = b"skip\x00glibc\x00\xd0\xbflib\x00\xff\x00tail"
+        header_data = {
+            1049: {"type": 8, "offset": 5, "count": 3, "data": data},
+            1050: {"type": 8, "offset": 5, "count": 1, "data": data},
+            1051: {"type": 8, "offset": 5, "count": 10, "data": data},
+        }
+
+        assert parser._get_header_string_array(header_data, 1049) == ["glibc", "пlib", "\xff"]
+        assert parser._get_header_string_array(header_data, 1050) == ["glibc"]
+        # The unterminated tail is not returned
+        assert parser._get_header_string_array(header_data, 1051) == ["glibc", "пlib", "\xff"]
+
     def test_get_header_int_array_missing_tag(self, parser):
         """Test getting int array from header with missing tag"""
         header_data = {}
         result = parser._get_header_int_array(header_data, 1000)
         assert result == []
 
+    def test_get_header_int_array(self, parser):
+        """Test decoding INT32 and INT16 arrays from header data"""
+        data = struct.pack(">3I", 1, 2, 0x01000000) + struct.pack(">2H", 7, 65535)
+        header_data = {
+            1048: {"type": 4, "offset": 0, "count": 3, "data": data},
+            1112: {"type": 3, "offset": 12, "count": 2, "data": data},
+            1113: {"type": 4, "offset": 8, "count": 5, "data": data},
+            1114: {"type": 4, "offset": len(data) + 4, "count": 2, "data": data},
+            1115: {"type": 4, "offset": len(data), "count": 1, "data": data},
+        }
+
+        assert parser._get_header_int_array(header_data, 1048) == [1, 2, 0x01000000]
+        assert parser._get_header_int_array(header_data, 1112) == [7, 65535]
+        # Entries running past the end of the data store are dropped
+        assert parser._get_header_int_array(header_data, 1113) == [0x01000000, 0x0007FFFF]
+        # Offsets at or past the end of the data store yield no entries
+        assert parser._get_header_int_array(header_data, 1114) == []
+        assert parser._get_header_int_array(header_data, 1115) == []
+
     def test_corrupted_rpm_file_handling(self, parser, temp_rpm_dir):
         """Test handling of corrupted RPM file"""
         corrupted_rpm = temp_rpm_dir / "corrupted.rpm"
@@ -3,6 +3,7 @@ Unit tests for repository downloader module.
 """
 
 import gzip
+import logging
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
@@ -82,6 +83,7 @@ class TestRepositoryDownloader:
         primary_gz_data = gzip.compress(SAMPLE_PRIMARY_XML)
         primary_response = Mock()
         primary_response.content = primary_gz_data
+        primary_response.iter_content = Mock(return_value=[primary_gz_data])
         primary_response.raise_for_status = Mock()
 
         # Configure mock to return different responses
@@ -94,11 +96,105 @@ class TestRepositoryDownloader:
         assert cache_path.exists()
         assert cache_path.is_file()
 
-        # Verify content
-        with open(cache_path, "rb") as f:
+        # Verify content (gzip metadata is cached compressed)
+        assert cache_path.name.endswith(".xml.gz")
+        with gzip.open(cache_path, "rb") as f:
             content = f.read()
             assert b"test-package" in content
 
+    @pytest.mark.parametrize("extension", ["gz", "zst", "xml"])
+    @patch("src.repository.requests.Session.get")
+    def test_download_standard_metadata_decompresses(
+        self, mock_get, downloader, temp_cache_dir, extension
+    ):
+        """Test that zstd and plain primary metadata are cached decompressed, gzip as is"""
+        if extension == "gz":
+            primary_data = gzip.compress(SAMPLE_PRIMARY_XML)
+        elif extension == "zst":
+            zstd = pytest.importorskip("zstandard")
+            primary_data = zstd.ZstdCompressor().compress(SAMPLE_PRIMARY_XML)
+        else:
+            primary_data = SAMPLE_PRIMARY_XML
+        repomd_xml = SAMPLE_REPOMD_XML.replace(b"primary.xml.gz", f"primary.{extension}".encode())
+
+        mock_get.side_effect = [
+            Mock(content=repomd_xml, raise_for_status=Mock()),
+            Mock(iter_content=Mock(return_value=[primary_data]), raise_for_status=Mock()),
+        ]
+
+        cache_path = downloader._download_standard_metadata("https://example.com/repo/", 1)
+
+        if extension == "gz":
+            assert cache_path.read_bytes() == primary_data
+        else:
+            assert cache_path.read_bytes() == SAMPLE_PRIMARY_XML
+        assert [p.name for p in downloader.get_package_list(cache_path)] == [
+            "test-package",
+            "source-package",
+        ]
+        assert not list(Path(temp_cache_dir).glob("*.download"))
+
+    @patch("src.repository.requests.Session.get")
+    def test_download_standard_metadata_reuses_cache(self, mock_get, downloader):
+        """Test that primary metadata is only downloaded again when repomd.xml changes"""
+        primary_gz_data = gzip.compress(SAMPLE_PRIMARY_XML)
+
+        def primary_response():
+            return Mock(iter_content=Mock(return_value=[primary_gz_data]), raise_for_status=Mock())
+
+        changed_repomd = SAMPLE_REPOMD_XML.replace(b"abc123", b"def456")
+        mock_get.side_effect = [
+            Mock(content=SAMPLE_REPOMD_XML, raise_for_status=Mock()),
+            primary_response(),
+            # Unchanged repomd.xml: no primary download
+            Mock(content=SAMPLE_REPOMD_XML, raise_for_status=Mock()),
+            # Changed repomd.xml: primary is downloaded again
+            Mock(content=changed_repomd, raise_for_status=Mock()),
+            primary_response(),
+        ]
+
+        repo_url = "https://example.com/repo/"
+        cache_path = downloader._download_standard_metadata(repo_url, 1)
+        assert downloader._download_standard_metadata(repo_url, 1) == cache_path
+        assert mock_get.call_count == 3
+
+        assert downloader._download_standard_metadata(repo_url, 1) == cache_path
+        assert mock_get.call_count == 5
+        assert cache_path.read_bytes() == primary_gz_data
+
+    @patch("src.repository.requests.Session.get")
+    def test_download_standard_metadata_cache_rewritten(self, mock_get, downloader):
+        """Test that a cache file rewritten since the download is not reused"""
+        repomd_xml = SAMPLE_REPOMD_XML.replace(b"primary.xml.gz", b"primary.xml")
+        mock_get.side_effect = [
+            Mock(content=repomd_xml, raise_for_status=Mock()),
+            Mock(iter_content=Mock(return_value=[SAMPLE_PRIMARY_XML]), raise_for_status=Mock()),
+            Mock(content=repomd_xml, raise_for_status=Mock()),
+            Mock(iter_content=Mock(return_value=[SAMPLE_PRIMARY_XML]), raise_for_status=Mock()),
+        ]
+        repo_url = "https://example.com/repo/"
+
+        cache_path = downloader._download_standard_metadata(repo_url, 1)
+        cache_path.write_bytes(b"<metadata/>")  # e.g. replaced by --extract-deps output
+
+        assert downloader._download_standard_metadata(repo_url, 1) == cache_path
+
+        assert mock_get.call_count == 4
+        assert cache_path.read_bytes() == SAMPLE_PRIMARY_XML
+
+    @patch("src.repository.requests.Session.get")
+    def test_download_standard_metadata_corrupt_gzip(self, mock_get, downloader, temp_cache_dir):
+        """Test that corrupt compressed metadata raises and leaves no cache file"""
+        mock_get.side_effect = [
+            Mock(content=SAMPLE_REPOMD_XML, raise_for_status=Mock()),
+            Mock(iter_content=Mock(return_value=[b"not gzip data"]), raise_for_status=Mock()),
+        ]
+
+        with pytest.raises(RepositoryDownloadError, match="Failed to cache metadata"):
+            downloader._download_standard_metadata("https://example.com/repo/", 1)
+
+        assert list(Path(temp_cache_dir).glob("primary_*.xml")) == []
+
     @patch("src.repository.requests.Session.get")
     def test_download_with_retry_on_network_failure(self, mock_get, downloader):
         """Test retry logic on network failures"""
@@ -114,6 +210,54 @@ class TestRepositoryDownloader:
         assert result == SAMPLE_REPOMD_XML
         assert mock_get.call_count == 3
 
+    @patch("src.repository.requests.Session.get")
+    def test_download_with_retry_to_file_streams_chunks(
+        self, mock_get, downloader, temp_cache_dir
+    ):
+        """Test that streamed downloads are written chunk by chunk and retried"""
+        response = Mock(iter_content=Mock(return_value=[b"abc", b"def"]), raise_for_status=Mock())
+        mock_get.side_effect = [requests.RequestException("Network error"), response]
+        dest_path = Path(temp_cache_dir) / "file.bin"
+
+        with patch("src.repository.time.sleep"):
+            result = downloader._download_with_retry_to_file(
+                "https://example.com/file", max_retries=2, dest_path=dest_path
+            )
+
+        assert result == dest_path
+        assert dest_path.read_bytes() == b"abcdef"
+        assert mock_get.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "headers,chunks",
+        [
+            ({"Content-Length": "11"}, [b"never read"]),
+            ({}, [b"12345", b"678901"]),
+        ],
+    )
+    @patch("src.repository.requests.Session.get")
+    def test_download_with_retry_to_file_size_limit(
+        self, mock_get, downloader, temp_cache_dir, headers, chunks
+    ):
+        """Test that oversized downloads abort early and leave no file behind"""
+        response = Mock(
+            headers=headers, iter_content=Mock(return_value=chunks), raise_for_status=Mock()
+        )
+        mock_get.return_value = response
+        dest_path = Path(temp_cache_dir) / "file.bin"
+
+        with pytest.raises(RepositoryDownloadError, match="exceeds"):
+            downloader._download_with_retry_to_file(
+                "https://example.com/file", max_retries=3, dest_path=dest_path, max_size=10
+            )
+
+        assert mock_get.call_count == 1
+        assert not dest_path.exists()
+        response.close.assert_called_once()
+        if "Content-Length" in headers:
+            response.iter_content.assert_not_called()
+
     @patch("src.repository.requests.Session.get")
     def test_download_fails_after_max_retries(self, mock_get, downloader):
         """Test that download fails after exhausting retries"""
@@ -149,18 +293,35 @@ class TestRepositoryDownloader:
         with pytest.raises(RepositoryDownloadError, match="Failed to parse repomd.xml"):
             downloader._parse_repomd(invalid_xml)
 
-    def test_cache_metadata_creates_file(self, downloader, temp_cache_dir):
-        """Test that caching creates a file with correct content"""
-        test_data = b"test metadata content"
+    def test_cache_metadata_lines_streams_file(self, downloader, temp_cache_dir):
+        """Test that streamed metadata lines are joined with newlines"""
         repo_url = "https://example.com/repo"
 
-        cache_path = downloader._cache_metadata(test_data, repo_url)
+        cache_path = downloader._cache_metadata_lines(iter(["<a>", "  <b/>", "</a>"]), repo_url)
 
-        assert cache_path.exists()
         assert cache_path.parent == Path(temp_cache_dir)
-
         with open(cache_path, "rb") as f:
-            assert f.read() == test_data
+            assert f.read() == b"<a>\n  <b/>\n</a>"
+
+    def test_cache_metadata_lines_size_limit(self, downloader, temp_cache_dir):
+        """Test that oversized streamed metadata is rejected and not left behind"""
+        repo_url = "https://example.com/repo"
+
+        with patch("src.repository.MAX_METADATA_SIZE", 10):
+            with pytest.raises(RepositoryDownloadError, match="too large"):
+                downloader._cache_metadata_lines(iter(["0123456789", "x"]), repo_url)
+
+        assert list(Path(temp_cache_dir).iterdir()) == []
+
+    def test_synthetic_metadata_is_parseable(self, downloader, temp_cache_dir):
+        """Test that streamed synthetic metadata round-trips through get_package_list"""
+        rpm_files = ["bash-4.2.46-35.el7.x86_64.rpm", "bash-4.2.46-35.el7.src.rpm"]
+        lines = downloader._create_synthetic_metadata(rpm_files, "https://example.com/repo")
+
+        cache_path = downloader._cache_metadata_lines(lines, "https://example.com/repo")
+        packages = downloader.get_package_list(cache_path)
+
+        assert [(p.name, p.arch) for p in packages] == [("bash", "x86_64"), ("bash", "src")]
 
     def test_get_package_list_parses_packages(self, downloader, temp_cache_dir):
         """Test parsing primary.xml to extract package list"""
@@ -217,9 +378,162 @@ class TestRepositoryDownloader:
         assert len(packages) == 1
         assert packages[0].name == "valid-package"
 
+    def test_get_package_list_without_namespace(self, downloader, temp_cache_dir):
+        """Test parsing primary.xml without a namespace or package count"""
+        plain_xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+        <metadata>
+          <package type="rpm">
+            <name>plain-package</name>
+            <version ver="2.0" rel="3"/>
+            <location href="Packages/plain-package-2.0-3.noarch.rpm"/>
+          </package>
+        </metadata>
+        """
+
+        primary_xml_path = Path(temp_cache_dir) / "primary.xml"
+        with open(primary_xml_path, "wb") as f:
+            f.write(plain_xml)
+
+        packages = downloader.get_package_list(primary_xml_path)
+
+        assert [(p.name, p.version, p.arch) for p in packages] == [
+            ("plain-package", "2.0", "noarch")
+        ]
+
+    @pytest.mark.parametrize("use_lxml", [True, False])
+    def test_get_package_list_parsers(self, downloader, temp_cache_dir, monkeypatch, use_lxml):
+        """Test that lxml and the ElementTree fallback produce the same packages"""
+        import src.repository as repository_module
+
+        if not use_lxml:
+            monkeypatch.setattr(repository_module, "lxml_etree", None)
+        elif repository_module.lxml_etree is None:
+            pytest.skip("lxml not installed")
+
+        primary_xml_path = Path(temp_cache_dir) / "primary.xml"
+        primary_xml_path.write_bytes(SAMPLE_PRIMARY_XML)
+
+        packages = downloader.get_package_list(primary_xml_path)
+
+        assert [p.name for p in packages] == ["test-package", "source-package"]
+
+    @pytest.mark.parametrize("use_lxml", [True, False])
+    def test_get_package_list_gzip_size_limit(
+        self, downloader, temp_cache_dir, monkeypatch, use_lxml
+    ):
+        """Test that compressed metadata inflating past the size limit is rejected"""
+        import src.repository as repository_module
+
+        if not use_lxml:
+            monkeypatch.setattr(repository_module, "lxml_etree", None)
+        elif repository_module.lxml_etree is None:
+            pytest.skip("lxml not installed")
+
+        primary_gz_path = Path(temp_cache_dir) / "primary.xml.gz"
+        primary_gz_path.write_bytes(gzip.compress(SAMPLE_PRIMARY_XML))
+        assert primary_gz_path.stat().st_size < len(SAMPLE_PRIMARY_XML) // 2
+
+        monkeypatch.setattr(repository_module, "MAX_METADATA_SIZE", len(SAMPLE_PRIMARY_XML) // 2)
+        with pytest.raises(RepositoryDownloadError, match="too large"):
+            downloader.get_package_list(primary_gz_path)
+
+        monkeypatch.setattr(repository_module, "MAX_METADATA_SIZE", len(SAMPLE_PRIMARY_XML))
+        assert len(downloader.get_package_list(primary_gz_path)) == 2
+
     def test_get_package_list_invalid_file_raises_error(self, downloader, temp_cache_dir):
         """Test that invalid XML file raises error"""
         invalid_path = Path(temp_cache_dir) / "nonexistent.xml"
 
         with pytest.raises(RepositoryDownloadError):
             downloader.get_package_list(invalid_path)
+
+    @pytest.mark.parametrize("threshold", [0, 1000])
+    def test_parse_rpm_files_reports_failures_in_order(
+        self, downloader, temp_cache_dir, monkeypatch, threshold
+    ):
+        """Test that pooled and serial RPM parsing return one result per file"""
+        monkeypatch.setattr("src.repository.PARALLEL_PARSE_THRESHOLD", threshold)
+        rpm_paths = []
+        for i in range(3):
+            rpm_path = Path(temp_cache_dir) / f"broken-{i}.rpm"
+            rpm_path.write_bytes(b"not an rpm")
+            rpm_paths.append(rpm_path)
+
+        results = list(downloader._parse_rpm_files(rpm_paths))
+
+        assert len(results) == 3
+        assert all(isinstance(result, Exception) for result in results)
+
+        # A lazily produced batch (e.g. files still downloading) works too
+        results = list(downloader._parse_rpm_files(iter(rpm_paths), count=len(rpm_paths)))
+
+        assert len(results) == 3
+        assert all(isinstance(result, Exception) for result in results)
+
+    def test_download_and_parse_rpms_keeps_input_order(self, downloader, temp_cache_dir, caplog):
+        """Test that concurrent downloads keep package order and skip failures"""
+        from src.parser import Dependency, PackageMetadata
+
+        caplog.set_level(logging.INFO, logger="src.repository")
+        rpm_files = [f"pkg{i}-1.0-1.x86_64.rpm" for i in range(6)]
+
+        def fake_download(url, max_retries, dest_path):
+            if url.endswith("pkg3-1.0-1.x86_64.rpm"):
+                raise RepositoryDownloadError("boom")
+            dest_path.write_bytes(b"rpm")
+            return dest_path
+
+        def fake_parse(rpm_paths, count=None):
+            for path in rpm_paths:
+                name = path.name.split("-")[0]
+                yield PackageMetadata(name, "1.0", "1", "x86_64", False), [Dependency("glibc")]
+
+        with patch.object(downloader, "_download_with_retry_to_file", side_effect=fake_download):
+            with patch.object(downloader, "_parse_rpm_files", side_effect=fake_parse):
+                cache_path = downloader.download_and_parse_rpms(
+                    "https://example.com/repo", rpm_files
+                )
+
+        packages = downloader.get_package_list(cache_path)
+        assert [p.name for p in packages] == ["pkg0", "pkg1", "pkg2", "pkg4", "pkg5"]
+        assert packages[0].requires == ["glibc"]
+        assert not list((Path(temp_cache_dir) / "rpms").glob("*.part"))
+        # Progress counts input files, so the failed download still reaches 100%
+        assert "Progress: 6/6 (100.0%)" in caplog.text
+
+    def test_escape_xml(self, downloader):
+        """Test that all five XML special characters are escaped"""
+        assert downloader._escape_xml("a&b<c>\"d'") == "a&amp;b&lt;c&gt;&quot;d&apos;"
+        assert downloader._escape_xml("&amp;") == "&amp;amp;"
+        assert downloader._escape_xml("plain") == "plain"
+
+    @pytest.mark.parametrize(
+        "rpm_file,expected",
+        [
+            ("bash-4.2.46-35.el7.x86_64.rpm", ("bash", "4.2.46", "35.el7", "x86_64")),
+            ("python3-rpm-macros-3-1.noarch.rpm", ("python3-rpm-macros", "3", "1", "noarch")),
+            ("bash-4.2.46-35.el7.src.rpm", ("bash", "4.2.46", "35.el7", "src")),
+            ("bash-4.2.46.x86_64.rpm", None),
+            ("bash-4.2.46-35.el7.x86_64.deb", None),
+            ("-1-2.x86_64.rpm", None),
+        ],
+    )
+    def test_split_rpm_filename(self, rpm_file, expected):
+        """Test splitting RPM filenames into name, version, release and arch"""
+        assert RepositoryDownloader._split_rpm_filename(rpm_file) == expected
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("ab12" * 16, True),
+            ("ABCDEF0123", True),
+            ("abc", False),
+            ("ab cd", False),
+            ("ab\n", False),
+            ("xyz1", False),
+            ("", False),
+        ],
+    )
+    def test_is_hex_digest(self, value, expected):
+        """Test checksum hex digest validation"""
+        assert RepositoryDownloader._is_hex_digest(value) is expected
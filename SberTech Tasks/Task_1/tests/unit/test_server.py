@@ -8,7 +8,15 @@ import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-from src.server import validate_graph_type, create_app, load_graph_file
+from src.server import (
+    validate_graph_type,
+    create_app,
+    load_graph_file,
+    load_graph_response_body,
+    read_graph_counts,
+    read_graph_json,
+)
+from src.validation import ValidationError
 
 
 class TestValidateGraphType:
@@ -101,6 +109,39 @@ class TestLoadGraphFile:
             assert len(result["nodes"]) == 1
             assert len(result["edges"]) == 1
 
+    @patch("src.server.app")
+    def test_load_compressed_graph_file(self, mock_app):
+        """Test loading a zstd-compressed graph file"""
+        zstd = pytest.importorskip("zstandard")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            graph_data = {"graph_type": "build", "nodes": [{"id": "pkg1"}], "edges": []}
+            graph_file = Path(tmpdir) / "build_graph.json.zst"
+            graph_file.write_bytes(zstd.ZstdCompressor().compress(json.dumps(graph_data).encode()))
+
+            mock_app.config = {"DATA_DIR": tmpdir}
+
+            assert load_graph_file("build") == graph_data
+
+    @patch("src.server.app")
+    def test_load_compressed_graph_file_size_limit(self, mock_app):
+        """Test that a small .zst file inflating past the size limit is rejected"""
+        zstd = pytest.importorskip("zstandard")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            padded_json = b" " * (2 * 1024 * 1024) + b'{"nodes": [], "edges": []}'
+            graph_file = Path(tmpdir) / "build_graph.json.zst"
+            graph_file.write_bytes(zstd.ZstdCompressor().compress(padded_json))
+
+            mock_app.config = {"DATA_DIR": tmpdir}
+
+            with patch("src.server.MAX_GRAPH_SIZE_MB", 1):
+                with pytest.raises(ValidationError, match="exceeds"):
+                    read_graph_json(graph_file)
+                assert load_graph_file("build") is None
+
+            assert load_graph_file("build") == {"nodes": [], "edges": []}
+
     @patch("src.server.app")
     def test_load_nonexistent_file(self, mock_app):
         """Test loading a non-existent graph file"""
@@ -133,6 +174,74 @@ class TestLoadGraphFile:
         assert result is None
 
 
+class TestLoadGraphResponseBody:
+    """Tests for load_graph_response_body function"""
+
+    @patch("src.server.app")
+    def test_body_cached_until_file_changes(self, mock_app):
+        """Test that the serialized graph is reused until the file changes"""
+        import os
+        import src.server as server_module
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            graph_file = Path(tmpdir) / "runtime_graph.json"
+            graph_file.write_text(json.dumps({"graph_type": "runtime", "nodes": [], "edges": []}))
+            mock_app.config = {"DATA_DIR": tmpdir}
+
+            with patch.object(
+                server_module, "read_graph_json", wraps=server_module.read_graph_json
+            ) as read:
+                body = load_graph_response_body("runtime")
+                assert json.loads(body)["graph_type"] == "runtime"
+                assert load_graph_response_body("runtime") is body
+                assert read.call_count == 1
+
+                graph_file.write_text(
+                    json.dumps({"graph_type": "runtime", "nodes": [{"id": "pkg1"}], "edges": []})
+                )
+                stat = graph_file.stat()
+                os.utime(graph_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+                assert len(json.loads(load_graph_response_body("runtime"))["nodes"]) == 1
+                assert read.call_count == 2
+
+    @patch("src.server.app")
+    def test_missing_file_returns_none(self, mock_app):
+        """Test that a missing graph file yields no body"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mock_app.config = {"DATA_DIR": tmpdir}
+
+            assert load_graph_response_body("build") is None
+            assert load_graph_response_body("../build") is None
+
+
+class TestReadGraphCounts:
+    """Tests for read_graph_counts function"""
+
+    def test_counts_cached_until_file_changes(self):
+        """Test that counts are reused until the file changes"""
+        import os
+        import src.server as server_module
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            graph_file = Path(tmpdir) / "build_graph.json"
+            graph_file.write_text(json.dumps({"nodes": [{"id": "a"}, {"id": "b"}], "edges": [{}]}))
+
+            with patch.object(
+                server_module, "read_graph_json", wraps=server_module.read_graph_json
+            ) as read:
+                assert read_graph_counts(graph_file) == (2, 1)
+                assert read_graph_counts(graph_file) == (2, 1)
+                assert read.call_count == 1
+
+                graph_file.write_text(json.dumps({"nodes": [], "edges": []}))
+                stat = graph_file.stat()
+                os.utime(graph_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+                assert read_graph_counts(graph_file) == (0, 0)
+                assert read.call_count == 2
+
+
 class TestRoutes:
     """Tests for Flask routes using the global app instance"""
 
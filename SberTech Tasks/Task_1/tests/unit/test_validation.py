@@ -156,6 +156,20 @@ class TestValidateFilePath:
             with pytest.raises(ValidationError):
                 validate_file_path("/tmp/other/file.txt", base_dir=tmpdir)
 
+    def test_relative_base_dir_follows_working_directory(self, monkeypatch):
+        """Test that a relative base_dir is resolved against the current directory"""
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            for root in (first, second):
+                (Path(root) / "data").mkdir()
+
+            monkeypatch.chdir(first)
+            validate_file_path(str(Path(first) / "data" / "graph.json"), base_dir="data")
+
+            monkeypatch.chdir(second)
+            validate_file_path(str(Path(second) / "data" / "graph.json"), base_dir="data")
+            with pytest.raises(ValidationError):
+                validate_file_path(str(Path(first) / "data" / "graph.json"), base_dir="data")
+
     def test_must_exist_file_not_found(self):
         """Test that non-existent file raises error when must_exist=True"""
         with pytest.raises(ValidationError):